@@ -1,8 +1,10 @@
 import streamlit as st
 import numpy as np
-from alambre import campo_alambre
-from espira import campo_espira
-from visualizacion_plotly import crear_grafico_2d_plotly, crear_grafico_3d_plotly
+from biot_savart import (campo_alambre, campo_escena, campo_espira, camino_circulo, error_cuadratura, flujo,
+                         flujo_por_potencial, integral_linea, mu0, nucleos_disponibles, potencial_escena,
+                         superficie_disco)
+from biot_savart.exportacion import exportar_a_bytes
+from biot_savart.visualizacion_plotly import crear_grafico_2d_plotly, crear_grafico_3d_plotly, tamano_payload
 
 # Configuración de la página
 st.set_page_config(
@@ -66,14 +68,32 @@ resolucion_2d = st.sidebar.slider(
 )
 resolucion_3d = st.sidebar.slider(
     "Resolución malla 3D",
-    min_value=4, max_value=12, value=8, step=1,
+    min_value=4, max_value=30, value=8, step=1,
     help="Número de puntos en cada dirección para el gráfico 3D"
 )
+max_conos = st.sidebar.slider(
+    "Conos máximos (3D)",
+    min_value=100, max_value=2000, value=600, step=100,
+    help="El campo se calcula en toda la malla, pero sólo se dibujan los conos más importantes"
+)
+vista_escalar = st.sidebar.selectbox(
+    "Vista de |B| en 3D",
+    ["Ninguna", "Isosuperficies", "Cortes"],
+    help="Agrega isosuperficies o cortes ortogonales de |B| a la vista 3D"
+)
+escalar_3d = {"Ninguna": None, "Isosuperficies": 'isosuperficies', "Cortes": 'cortes'}[vista_escalar]
 N_elementos = st.sidebar.slider(
     "Elementos de corriente (N)",
     min_value=500, max_value=3000, value=1000, step=100,
     help="Número de segmentos para integración numérica (mayor = más preciso pero más lento)"
 )
+opciones_nucleo = nucleos_disponibles()
+nucleo = st.sidebar.selectbox(
+    "Núcleo de cálculo",
+    opciones_nucleo,
+    index=opciones_nucleo.index('numba') if 'numba' in opciones_nucleo else 0,
+    help="'numba' compila la suma de Biot-Savart (requiere tener numba instalado)"
+)
 
 # ============================================================================
 # CÁLCULO DE CAMPOS
@@ -94,34 +114,68 @@ r_3d = np.c_[xx_3d.ravel(), yy_3d.ravel(), zz_3d.ravel()]
 
 # Calcular campos con caché para optimización
 @st.cache_data
-def calcular_campo_alambre(I, L, z_off, N, r_shape):
+def calcular_campo_alambre(I, L, z_off, N, r_shape, nucleo):
+    r_flat = r_shape.reshape(-1, 3)
+    return campo_alambre(I, L, N, r_flat, z_offset=z_off, nucleo=nucleo)
+
+@st.cache_data
+def calcular_campo_espira(I, a, z_off, N, r_shape, nucleo):
     r_flat = r_shape.reshape(-1, 3)
-    return campo_alambre(I, L, N, r_flat, z_offset=z_off)
+    return campo_espira(I, a, N, r_flat, z_offset=z_off, nucleo=nucleo)
 
 @st.cache_data
-def calcular_campo_espira(I, a, z_off, N, r_shape):
+def estimar_error_cuadratura(I_a, L, z_a, I_e, a, z_e, N, r_shape, nucleo, B_N):
+    # Error relativo del campo total con N elementos (percentil 95 sobre la malla);
+    # B_N es el campo ya calculado con N, así que sólo se agrega el de N/2
     r_flat = r_shape.reshape(-1, 3)
-    return campo_espira(I, a, N, r_flat, z_offset=z_off)
+    _, error = error_cuadratura(
+        lambda n: (campo_alambre(I_a, L, n, r_flat, z_offset=z_a, nucleo=nucleo)
+                   + campo_espira(I_e, a, n, r_flat, z_offset=z_e, nucleo=nucleo)),
+        N, B_N
+    )
+    return np.percentile(error, 95)
+
+@st.cache_data
+def calcular_integrales(I_a, L, z_a, I_e, a, z_e, N, nucleo, radio_c, z_c, radio_d, z_d):
+    # Circulación de B y flujo por un disco, ambos coaxiales con el eje Z
+    B = campo_escena(I_a, L, I_e, a, N, z_a, z_e, nucleo)
+    A = potencial_escena(I_a, L, I_e, a, N, z_a, z_e, nucleo)
+    circulacion = integral_linea(B, camino_circulo(radio_c, (0, 0, z_c)), n=32)
+    flujo_sup = flujo(B, superficie_disco(radio_d, (0, 0, z_d)), n=12)
+    flujo_borde = flujo_por_potencial(A, camino_circulo(radio_d, (0, 0, z_d)), n=32)
+    return circulacion, flujo_sup, flujo_borde
+
+TOLERANCIA_CUADRATURA = 0.01
 
 with st.spinner('Calculando campos magnéticos...'):
     # Campos 2D
-    B_alambre_2d = calcular_campo_alambre(I_alambre, L_alambre, z_offset_alambre, N_elementos, r_2d)
-    B_espira_2d = calcular_campo_espira(I_espira, a_espira, z_offset_espira, N_elementos, r_2d)
+    B_alambre_2d = calcular_campo_alambre(I_alambre, L_alambre, z_offset_alambre, N_elementos, r_2d, nucleo)
+    B_espira_2d = calcular_campo_espira(I_espira, a_espira, z_offset_espira, N_elementos, r_2d, nucleo)
     B_total_2d = B_alambre_2d + B_espira_2d
     
     # Campos 3D
-    B_alambre_3d = calcular_campo_alambre(I_alambre, L_alambre, z_offset_alambre, N_elementos, r_3d)
-    B_espira_3d = calcular_campo_espira(I_espira, a_espira, z_offset_espira, N_elementos, r_3d)
+    B_alambre_3d = calcular_campo_alambre(I_alambre, L_alambre, z_offset_alambre, N_elementos, r_3d, nucleo)
+    B_espira_3d = calcular_campo_espira(I_espira, a_espira, z_offset_espira, N_elementos, r_3d, nucleo)
     B_total_3d = B_alambre_3d + B_espira_3d
 
+error_2d = estimar_error_cuadratura(I_alambre, L_alambre, z_offset_alambre,
+                                    I_espira, a_espira, z_offset_espira, N_elementos, r_2d, nucleo,
+                                    B_total_2d)
+if error_2d > TOLERANCIA_CUADRATURA:
+    st.sidebar.warning(
+        f"⚠️ Con N = {N_elementos} el error de integración estimado (Richardson) "
+        f"llega a {error_2d:.1%} en la malla 2D. Aumente N para mayor precisión."
+    )
+
 # ============================================================================
 # TABS DE VISUALIZACIÓN
 # ============================================================================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "🔴 Alambre Recto",
     "🔵 Espira Circular",
     "🟣 Superposición",
     "📍 Punto de Prueba",
+    "∮ Integrales",
     "📚 Información"
 ])
 
@@ -149,9 +203,11 @@ with tab1:
             xx_3d.ravel(), yy_3d.ravel(), zz_3d.ravel(),
             B_alambre_3d[:, 0], B_alambre_3d[:, 1], B_alambre_3d[:, 2],
             titulo="",
-            geometria={'tipo': 'alambre', 'L': L_alambre, 'z_offset_alambre': z_offset_alambre}
+            geometria={'tipo': 'alambre', 'L': L_alambre, 'z_offset_alambre': z_offset_alambre},
+            max_conos=max_conos, escalar=escalar_3d
         )
         st.plotly_chart(fig_3d_alambre, use_container_width=True)
+        st.caption(f"Datos enviados al navegador: {tamano_payload(fig_3d_alambre) / 1024:.0f} kB")
 
 # --- TAB 2: ESPIRA ---
 with tab2:
@@ -177,9 +233,11 @@ with tab2:
             xx_3d.ravel(), yy_3d.ravel(), zz_3d.ravel(),
             B_espira_3d[:, 0], B_espira_3d[:, 1], B_espira_3d[:, 2],
             titulo="",
-            geometria={'tipo': 'espira', 'a': a_espira, 'z_offset_espira': z_offset_espira}
+            geometria={'tipo': 'espira', 'a': a_espira, 'z_offset_espira': z_offset_espira},
+            max_conos=max_conos, escalar=escalar_3d
         )
         st.plotly_chart(fig_3d_espira, use_container_width=True)
+        st.caption(f"Datos enviados al navegador: {tamano_payload(fig_3d_espira) / 1024:.0f} kB")
 
 # --- TAB 3: SUPERPOSICIÓN ---
 with tab3:
@@ -216,9 +274,23 @@ with tab3:
                 'L': L_alambre, 'a': a_espira,
                 'z_offset_alambre': z_offset_alambre,
                 'z_offset_espira': z_offset_espira
-            }
+            },
+            max_conos=max_conos, escalar=escalar_3d
         )
         st.plotly_chart(fig_3d_total, use_container_width=True)
+        st.caption(f"Datos enviados al navegador: {tamano_payload(fig_3d_total) / 1024:.0f} kB")
+        
+        # meshgrid por defecto ordena (y, x, z); los exportadores esperan x más rápido
+        n3 = resolucion_3d
+        B_total_vtk = B_total_3d.reshape(n3, n3, n3, 3).transpose(2, 0, 1, 3)
+        formato = st.selectbox("Formato de exportación", ['vti', 'vts', 'npz'],
+                               help="VTK para ParaView o .npz comprimido para NumPy")
+        st.download_button(
+            "💾 Descargar campo 3D",
+            data=exportar_a_bytes(x_3d, y_3d, z_3d, B_total_vtk, formato),
+            file_name=f"campo_superposicion.{formato}",
+            mime="application/octet-stream"
+        )
 
 # --- TAB 4: PUNTO DE PRUEBA ---
 with tab4:
@@ -239,6 +311,12 @@ with tab4:
     B_espira_punto = campo_espira(I_espira, a_espira, N_elementos, punto_test, z_offset_espira)
     B_total_punto = B_alambre_punto + B_espira_punto
     
+    B_extrapolado, error_punto = error_cuadratura(
+        lambda n: campo_alambre(I_alambre, L_alambre, n, punto_test, z_offset_alambre)
+        + campo_espira(I_espira, a_espira, n, punto_test, z_offset_espira),
+        N_elementos, B_total_punto
+    )
+    
     st.markdown("---")
     
     col1, col2, col3 = st.columns(3)
@@ -254,9 +332,62 @@ with tab4:
     with col3:
         st.metric("🟣 Total", f"{np.linalg.norm(B_total_punto):.6e} T")
         st.code(f"Bx = {B_total_punto[0,0]:.6e} T\nBy = {B_total_punto[0,1]:.6e} T\nBz = {B_total_punto[0,2]:.6e} T")
+    
+    st.caption(
+        f"Error de integración estimado con N = {N_elementos}: {error_punto[0]:.2e} (relativo). "
+        f"|B| extrapolado (Richardson): {np.linalg.norm(B_extrapolado):.6e} T"
+    )
+    if error_punto[0] > TOLERANCIA_CUADRATURA:
+        st.warning("⚠️ El punto está demasiado cerca de un conductor para este N; aumente N.")
 
-# --- TAB 5: INFORMACIÓN ---
+# --- TAB 5: INTEGRALES ---
 with tab5:
+    st.header("Ley de Ampère y Flujo Magnético")
+    st.markdown("Integrales del campo total sobre una circunferencia y un disco coaxiales con el eje Z.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        radio_c = st.number_input("Radio de la circunferencia (m)", value=0.3, min_value=0.05, step=0.05, format="%.2f")
+        z_c = st.number_input("Altura de la circunferencia (m)", value=0.0, step=0.1, format="%.2f")
+    with col2:
+        radio_d = st.number_input("Radio del disco (m)", value=0.3, min_value=0.05, step=0.05, format="%.2f")
+        z_d = st.number_input("Altura del disco (m)", value=0.2, step=0.1, format="%.2f")
+
+    with st.spinner('Integrando...'):
+        (circ, error_circ), (phi_sup, error_sup), (phi_borde, error_borde) = calcular_integrales(
+            I_alambre, L_alambre, z_offset_alambre, I_espira, a_espira, z_offset_espira,
+            N_elementos, nucleo, radio_c, z_c, radio_d, z_d
+        )
+
+    # Alambre finito: mu0 I / 2 (sin θ2 - sin θ1) vista desde la altura de la circunferencia
+    extremos = np.array([-L_alambre/2, L_alambre/2]) + z_offset_alambre - z_c
+    senos = extremos / np.sqrt(extremos**2 + radio_c**2)
+    circ_teorica = mu0 * I_alambre / 2 * (senos[1] - senos[0])
+
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("∮ B · dl")
+        st.metric("Circulación", f"{circ:.6e} T·m")
+        st.code(f"Error de cuadratura  = {error_circ:.2e} T·m\n"
+                f"Alambre finito (teo) = {circ_teorica:.6e} T·m\n"
+                f"μ0 I (alambre ∞)     = {mu0 * I_alambre:.6e} T·m")
+    with col2:
+        st.subheader("∬ B · dA")
+        st.metric("Flujo", f"{phi_sup:.6e} Wb")
+        st.code(f"Cuadratura de superficie = {phi_sup:.6e} ± {error_sup:.1e} Wb\n"
+                f"∮ A · dl del borde       = {phi_borde:.6e} ± {error_borde:.1e} Wb")
+
+    st.caption(
+        "La circulación sólo depende del alambre: la espira no enlaza la circunferencia. "
+        "El flujo se calcula por la superficie (5·12² puntos) y por el teorema de Stokes "
+        "con el potencial vector sobre el borde (3·32 puntos); ambos deben coincidir."
+    )
+    if I_espira and radio_d > a_espira - 0.05 and abs(z_d - z_offset_espira) < 0.05:
+        st.warning("⚠️ El disco toca o corta la espira: el campo es singular ahí y el flujo no converge.")
+
+# --- TAB 6: INFORMACIÓN ---
+with tab6:
     st.header("📚 Ley de Biot-Savart")
     
     st.markdown("""
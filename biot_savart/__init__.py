@@ -0,0 +1,47 @@
+"""
+Campo magnético por la Ley de Biot-Savart: alambre recto y espira circular.
+
+Importar el paquete sólo carga NumPy y los solvers. Las funciones de
+visualización (matplotlib, Plotly) y el servicio local se cargan recién
+la primera vez que se usan.
+"""
+import importlib
+
+from .alambre import biot_savart, campo_alambre, distancia_alambre, mu0, potencial_alambre
+from .espira import campo_espira, distancia_espira, potencial_espira
+from .nucleos import nucleos_disponibles, obtener_nucleo, registrar_nucleo
+from .campo_streaming import campo_escena, evaluar_bloques_en_disco, evaluar_malla_en_disco, potencial_escena
+from .convergencia import (campo_alambre_richardson, campo_espira_richardson,
+                           error_cuadratura, extrapolar_richardson)
+from .animacion import campos_unitarios, construir_cuadros, corrientes_armonicas, exportar_cuadros
+from .exportacion import cargar_binario, exportar_campo
+from .integrales import (borde_rectangulo, camino_circulo, camino_poligono, flujo, flujo_malla,
+                         flujo_por_potencial, integral_linea, superficie_disco, superficie_rectangulo)
+from .particulas import empujar_particulas, interpolador_malla, mapa_de_campo
+
+# Nombre público -> submódulo que lo define (carga diferida)
+_DIFERIDOS = {
+    'graficar_2d': 'graficos',
+    'graficar_3d': 'graficos',
+    'graficar_trayectorias': 'graficos',
+    'crear_grafico_2d_plotly': 'visualizacion_plotly',
+    'crear_grafico_3d_plotly': 'visualizacion_plotly',
+    'crear_animacion_2d_plotly': 'visualizacion_plotly',
+    'crear_grafico_trayectorias_plotly': 'visualizacion_plotly',
+    'tamano_payload': 'visualizacion_plotly',
+    'ClienteCampo': 'servicio',
+    'ServidorCampo': 'servicio',
+}
+
+
+def __getattr__(nombre):
+    if nombre in _DIFERIDOS:
+        modulo = importlib.import_module(f'.{_DIFERIDOS[nombre]}', __name__)
+        valor = getattr(modulo, nombre)
+        globals()[nombre] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_DIFERIDOS))
@@ -0,0 +1,85 @@
+import numpy as np
+from .alambre import campo_alambre
+from .espira import campo_espira
+
+
+def campos_unitarios(r_puntos, L_alambre, a_espira, N, z_offset_alambre=0, z_offset_espira=0,
+                     nucleo='numpy'):
+    """
+    Calcula una sola vez el campo de cada fuente con corriente unitaria (1 A).
+
+    Como B es lineal en I, el campo con cualquier corriente I_k(t) se obtiene
+    escalando estos campos, sin volver a integrar.
+
+    Args:
+        r_puntos: Puntos de evaluación (n, 3)
+        L_alambre, a_espira: Geometría de las fuentes
+        N: Elementos de corriente
+        z_offset_alambre, z_offset_espira: Posiciones de las fuentes
+        nucleo: Núcleo de cálculo (ver biot_savart.nucleos)
+
+    Returns:
+        B_unitarios: Array (2, n, 3) con los campos del alambre y de la espira
+    """
+    return np.stack([
+        campo_alambre(1.0, L_alambre, N, r_puntos, z_offset_alambre, nucleo),
+        campo_espira(1.0, a_espira, N, r_puntos, z_offset_espira, nucleo),
+    ])
+
+
+def corrientes_armonicas(tiempos, amplitudes, frecuencias, fases=0.0):
+    """
+    Corrientes alternas I_k(t) = A_k cos(2 pi f_k t + fase_k).
+
+    Args:
+        tiempos: Instantes (T,)
+        amplitudes: Amplitud de cada fuente (K,), en A
+        frecuencias: Frecuencia de cada fuente (K,) o una común, en Hz
+        fases: Fase de cada fuente (K,) o una común, en rad
+
+    Returns:
+        corrientes: Array (T, K)
+    """
+    t = np.asarray(tiempos, dtype=float)[:, None]
+    return np.asarray(amplitudes) * np.cos(2 * np.pi * np.asarray(frecuencias) * t + np.asarray(fases))
+
+
+def construir_cuadros(B_unitarios, corrientes, salida=None):
+    """
+    Arma el campo de cada cuadro como combinación lineal sum_k I_k(t) B_k.
+
+    Args:
+        B_unitarios: Campos unitarios (K, n, 3)
+        corrientes: Corrientes por cuadro (T, K)
+        salida: Array (T, n, 3) donde escribir el resultado (p. ej. un memmap);
+                si es None se crea uno nuevo
+
+    Returns:
+        cuadros: Array (T, n, 3) con el campo en cada instante
+    """
+    K, n, _ = B_unitarios.shape
+    if salida is None:
+        return np.tensordot(corrientes, B_unitarios, axes=1)
+    # Cuadro a cuadro, para no materializar la pila completa en memoria
+    B_planos = B_unitarios.reshape(K, -1)
+    for i, I_t in enumerate(corrientes):
+        salida[i] = (I_t @ B_planos).reshape(n, 3)
+    return salida
+
+
+def exportar_cuadros(ruta, B_unitarios, corrientes, tiempos=None):
+    """
+    Escribe la pila de cuadros (T, n, 3) en un .npy mapeado en memoria.
+
+    Si se dan los tiempos, se guardan junto a los cuadros en '<ruta>.tiempos.npy'.
+
+    Returns:
+        cuadros: Array (T, n, 3) mapeado en memoria
+    """
+    forma = (len(corrientes),) + B_unitarios.shape[1:]
+    cuadros = np.lib.format.open_memmap(ruta, mode='w+', dtype=np.float64, shape=forma)
+    construir_cuadros(B_unitarios, corrientes, salida=cuadros)
+    cuadros.flush()
+    if tiempos is not None:
+        np.save(ruta + '.tiempos.npy', np.asarray(tiempos, dtype=float))
+    return cuadros
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from .alambre import campo_alambre, potencial_alambre
+from .espira import campo_espira, potencial_espira
+
+TAM_BLOQUE = 100_000
+
+
+def puntos_malla(x, y, z, inicio, fin):
+    """
+    Genera los puntos [inicio, fin) de una malla regular sin construirla entera.
+
+    El orden es el de VTK: x varía más rápido, luego y, luego z, de modo que
+    el resultado aplanado se puede remodelar como (nz, ny, nx, 3).
+
+    Args:
+        x, y, z: Ejes de la malla (arrays 1D)
+        inicio, fin: Rango de índices planos a generar
+
+    Returns:
+        r_puntos: Array (fin - inicio, 3) con las coordenadas
+    """
+    nx, ny = len(x), len(y)
+    idx = np.arange(inicio, fin)
+    ix = idx % nx
+    iy = (idx // nx) % ny
+    iz = idx // (nx * ny)
+    return np.c_[np.asarray(x)[ix], np.asarray(y)[iy], np.asarray(z)[iz]]
+
+
+def bloques_malla(x, y, z, tam_bloque=TAM_BLOQUE, inicio=0):
+    """
+    Itera sobre una malla regular en bloques de a lo sumo tam_bloque puntos.
+
+    Args:
+        x, y, z: Ejes de la malla (arrays 1D)
+        tam_bloque: Cantidad máxima de puntos por bloque
+        inicio: Índice plano desde el cual empezar
+
+    Yields:
+        r_bloque: Array (n, 3) con las coordenadas del bloque
+    """
+    n_puntos = len(x) * len(y) * len(z)
+    for i0 in range(inicio, n_puntos, tam_bloque):
+        yield puntos_malla(x, y, z, i0, min(i0 + tam_bloque, n_puntos))
+
+
+def _ruta_progreso(ruta):
+    return ruta + '.progreso.json'
+
+
+def _huella(clave):
+    # Resumen estable de todo lo que determina el resultado (ejes, escena, núcleo)
+    h = hashlib.sha256()
+
+    def agregar(obj):
+        if isinstance(obj, np.ndarray):
+            h.update(f'array{obj.shape}'.encode())
+            h.update(np.ascontiguousarray(obj, dtype=np.float64).tobytes())
+        elif isinstance(obj, (list, tuple)):
+            h.update(b'(')
+            for o in obj:
+                agregar(o)
+            h.update(b')')
+        elif isinstance(obj, dict):
+            agregar(sorted(obj.items()))
+        else:
+            h.update(repr(obj).encode() + b';')
+
+    agregar(clave)
+    return h.hexdigest()
+
+
+def _leer_progreso(ruta, n_puntos, huella):
+    # Sólo se reanuda si el archivo de salida y su registro de avance coinciden
+    # y si corresponden al mismo cálculo
+    if not (os.path.exists(ruta) and os.path.exists(_ruta_progreso(ruta))):
+        return 0
+    with open(_ruta_progreso(ruta)) as f:
+        progreso = json.load(f)
+    if progreso.get('n_puntos') != n_puntos or progreso.get('huella') != huella:
+        return 0
+    return progreso['completados']
+
+
+def _guardar_progreso(ruta, n_puntos, huella, completados):
+    # Escritura atómica: una interrupción nunca deja el registro a medias
+    tmp = _ruta_progreso(ruta) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'n_puntos': n_puntos, 'huella': huella, 'completados': completados}, f)
+    os.replace(tmp, _ruta_progreso(ruta))
+
+
+def evaluar_bloques_en_disco(funcion_campo, bloques, n_puntos, ruta, reanudar=True, clave=None, inicio=0):
+    """
+    Evalúa un campo bloque a bloque y escribe el resultado en un .npy mapeado.
+
+    La memoria usada queda acotada por el tamaño del bloque y no por el del
+    dominio. Tras cada bloque se registra el avance en '<ruta>.progreso.json',
+    lo que permite reanudar un cálculo interrumpido. El registro guarda una
+    huella de 'clave', y si una corrida nueva trae otra clave se empieza de cero.
+
+    Args:
+        funcion_campo: Función r_puntos (n, 3) -> B (n, 3)
+        bloques: Iterable de arrays (n_i, 3) con los puntos desde 'inicio' hasta n_puntos
+        n_puntos: Cantidad total de puntos
+        ruta: Archivo .npy de salida
+        reanudar: Si es True, saltea los puntos ya calculados en una corrida previa
+        clave: Todo lo que determina el resultado (puntos, parámetros de la
+               escena, núcleo...): arrays, números, cadenas, tuplas o dicts
+        inicio: Índice del primer punto de 'bloques'; permite no volver a
+                generar los puntos ya calculados al reanudar
+
+    Returns:
+        B: Array (n_puntos, 3) mapeado en memoria (sólo lectura)
+    """
+    huella = _huella(clave)
+    completados = _leer_progreso(ruta, n_puntos, huella) if reanudar else 0
+    if completados == 0:
+        B = np.lib.format.open_memmap(ruta, mode='w+', dtype=np.float64, shape=(n_puntos, 3))
+    else:
+        B = np.load(ruta, mmap_mode='r+')
+
+    if inicio > completados:
+        raise ValueError(f"Los bloques empiezan en el punto {inicio}, pero sólo hay {completados} calculados")
+
+    i0 = inicio
+    for r_bloque in bloques:
+        i1 = i0 + len(r_bloque)
+        if i1 > completados:
+            # Un bloque puede estar parcialmente hecho si cambió su tamaño
+            desde = max(completados - i0, 0)
+            B[i0 + desde:i1] = funcion_campo(r_bloque[desde:])
+            B.flush()
+            completados = i1
+            _guardar_progreso(ruta, n_puntos, huella, completados)
+        i0 = i1
+
+    if i0 != n_puntos:
+        raise ValueError(f"Los bloques suman {i0} puntos, se esperaban {n_puntos}")
+
+    del B
+    return np.load(ruta, mmap_mode='r')
+
+
+def evaluar_malla_en_disco(funcion_campo, x, y, z, ruta, tam_bloque=TAM_BLOQUE, reanudar=True, clave=None):
+    """
+    Evalúa un campo sobre una malla regular escribiendo directamente a disco.
+
+    Args:
+        funcion_campo: Función r_puntos (n, 3) -> B (n, 3)
+        x, y, z: Ejes de la malla (arrays 1D)
+        ruta: Archivo .npy de salida
+        tam_bloque: Cantidad máxima de puntos por bloque
+        reanudar: Si es True, continúa una corrida interrumpida
+        clave: Parámetros de la escena y núcleo (ver evaluar_bloques_en_disco);
+               los ejes se agregan solos. Sin clave, sólo se reanuda si los ejes
+               coinciden.
+
+    Returns:
+        B: Array (nx*ny*nz, 3) mapeado en memoria, en orden x más rápido
+    """
+    n_puntos = len(x) * len(y) * len(z)
+    # Los ejes forman parte de la huella: tam_bloque no, porque no cambia el resultado
+    clave = tuple(np.asarray(e, dtype=np.float64) for e in (x, y, z)) + (clave,)
+    completados = _leer_progreso(ruta, n_puntos, _huella(clave)) if reanudar else 0
+    # En una malla no hace falta recorrer los bloques ya calculados
+    inicio = completados - completados % tam_bloque
+    bloques = bloques_malla(x, y, z, tam_bloque, inicio)
+    return evaluar_bloques_en_disco(funcion_campo, bloques, n_puntos, ruta, reanudar, clave, inicio)
+
+
+def campo_escena(I_alambre=0.0, L_alambre=2.0, I_espira=0.0, a_espira=0.5, N=1000,
+                 z_offset_alambre=0.0, z_offset_espira=0.0, nucleo='numpy'):
+    """
+    Devuelve la función de campo total (alambre + espira) de una escena.
+
+    nucleo elige el núcleo de cálculo (ver biot_savart.nucleos).
+
+    Returns:
+        funcion_campo: Función r_puntos (n, 3) -> B (n, 3)
+    """
+    def funcion_campo(r_puntos):
+        B = np.zeros_like(r_puntos, dtype=np.float64)
+        if I_alambre:
+            B += campo_alambre(I_alambre, L_alambre, N, r_puntos, z_offset_alambre, nucleo)
+        if I_espira:
+            B += campo_espira(I_espira, a_espira, N, r_puntos, z_offset_espira, nucleo)
+        return B
+    return funcion_campo
+
+
+def potencial_escena(I_alambre=0.0, L_alambre=2.0, I_espira=0.0, a_espira=0.5, N=1000,
+                     z_offset_alambre=0.0, z_offset_espira=0.0, nucleo='numpy'):
+    """
+    Devuelve la función de potencial vector total (alambre + espira) de una escena.
+
+    nucleo elige el núcleo de cálculo, igual que en campo_escena.
+
+    Returns:
+        funcion_potencial: Función r_puntos (n, 3) -> A (n, 3)
+    """
+    def funcion_potencial(r_puntos):
+        A = np.zeros_like(r_puntos, dtype=np.float64)
+        if I_alambre:
+            A += potencial_alambre(I_alambre, L_alambre, N, r_puntos, z_offset_alambre, nucleo)
+        if I_espira:
+            A += potencial_espira(I_espira, a_espira, N, r_puntos, z_offset_espira, nucleo)
+        return A
+    return funcion_potencial
@@ -0,0 +1,108 @@
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+from .servicio import ClienteCampo, ServidorCampo, ServidorCampoUnix
+
+ESCENA = dict(I_alambre=10.0, L_alambre=2.0, I_espira=5.0, a_espira=0.5, N=1000)
+
+
+def prueba_de_carga(crear_cliente, clientes=16, pedidos=50, puntos=64, semilla=0):
+    """
+    Lanza pedidos concurrentes contra el servicio y mide rendimiento y latencia.
+
+    Args:
+        crear_cliente: Función sin argumentos que devuelve un ClienteCampo nuevo
+        clientes: Cantidad de hilos cliente concurrentes
+        pedidos: Pedidos por cliente
+        puntos: Puntos por pedido
+
+    Returns:
+        resultados: dict con pedidos/s, puntos/s y latencias p50/p99 en ms
+    """
+    cliente = crear_cliente()
+    id_escena = cliente.registrar_escena(**ESCENA)
+    inicial = cliente.estadisticas()
+
+    latencias = [[] for _ in range(clientes)]
+    rng = np.random.default_rng(semilla)
+    lotes = rng.uniform(-1.5, 1.5, size=(clientes, pedidos, puntos, 3))
+
+    def trabajar(i):
+        c = crear_cliente()
+        for r in lotes[i]:
+            t0 = time.perf_counter()
+            c.campo(id_escena, r)
+            latencias[i].append(time.perf_counter() - t0)
+        c.cerrar()
+
+    hilos = [threading.Thread(target=trabajar, args=(i,)) for i in range(clientes)]
+    t0 = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    duracion = time.perf_counter() - t0
+
+    final = cliente.estadisticas()
+    cliente.cerrar()
+    todas = np.concatenate(latencias) * 1000
+    total = clientes * pedidos
+    return {
+        'pedidos': total,
+        'duracion_s': duracion,
+        'pedidos_por_s': total / duracion,
+        'puntos_por_s': total * puntos / duracion,
+        'p50_ms': np.percentile(todas, 50),
+        'p99_ms': np.percentile(todas, 99),
+        'llamadas_kernel': final['llamadas_kernel'] - inicial['llamadas_kernel'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Prueba de carga del servicio de campo (por defecto levanta uno propio)")
+    parser.add_argument('--host', help="Usar un servicio TCP ya en marcha")
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--socket', help="Usar (o levantar) un servicio en este socket Unix")
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--pedidos', type=int, default=50, help="Pedidos por cliente")
+    parser.add_argument('--puntos', type=int, default=64, help="Puntos por pedido")
+    args = parser.parse_args(argv)
+
+    servidor = None
+    if args.host:
+        crear_cliente = lambda: ClienteCampo(args.host, args.puerto)
+    elif args.socket and os.path.exists(args.socket):
+        crear_cliente = lambda: ClienteCampo(socket_unix=args.socket)
+    else:
+        if args.socket:
+            servidor = ServidorCampoUnix(args.socket)
+            crear_cliente = lambda: ClienteCampo(socket_unix=args.socket)
+        else:
+            servidor = ServidorCampo(('127.0.0.1', 0))
+            puerto = servidor.server_address[1]
+            crear_cliente = lambda: ClienteCampo('127.0.0.1', puerto)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    try:
+        res = prueba_de_carga(crear_cliente, args.clientes, args.pedidos, args.puntos)
+    finally:
+        if servidor:
+            servidor.shutdown()
+            servidor.server_close()
+
+    print(f"Pedidos:          {res['pedidos']} ({args.clientes} clientes x {args.pedidos})")
+    print(f"Duración:         {res['duracion_s']:.2f} s")
+    print(f"Rendimiento:      {res['pedidos_por_s']:.1f} pedidos/s, {res['puntos_por_s']:.3e} puntos/s")
+    print(f"Latencia p50:     {res['p50_ms']:.1f} ms")
+    print(f"Latencia p99:     {res['p99_ms']:.1f} ms")
+    print(f"Llamadas núcleo:  {res['llamadas_kernel']} "
+          f"({res['pedidos'] / max(res['llamadas_kernel'], 1):.1f} pedidos por llamada)")
+    return res
+
+
+if __name__ == '__main__':
+    main()
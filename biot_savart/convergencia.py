@@ -0,0 +1,96 @@
+import numpy as np
+from .alambre import campo_alambre
+from .espira import campo_espira
+
+
+def extrapolar_richardson(funcion_N, Ns):
+    """
+    Extrapolación de Richardson de un campo calculado con N elementos.
+
+    Tanto campo_alambre como campo_espira usan un paso h = cte / (N - 1) y su
+    error se desarrolla en potencias de h (el término dominante es O(h), por
+    los extremos de la suma). Se ajusta un polinomio en h a los resultados
+    y se evalúa en h = 0 (esquema de Neville), lo que elimina los órdenes
+    h, h^2, ... sucesivamente.
+
+    Args:
+        funcion_N: Función N -> B (n, 3) (p. ej. lambda N: campo_alambre(I, L, N, r))
+        Ns: Resoluciones a usar, de menor a mayor (dos o tres suelen bastar)
+
+    Returns:
+        B: Campo extrapolado (n, 3)
+        error: Estimación del error de B por punto (n,), en T
+
+    Raises:
+        ValueError: Si hay menos de dos resoluciones, alguna es menor que 2 o
+                    no son estrictamente crecientes
+    """
+    if len(Ns) < 2:
+        raise ValueError("Se necesitan al menos dos resoluciones")
+    if min(Ns) < 2:
+        raise ValueError(f"Cada resolución necesita al menos 2 elementos: {list(Ns)}")
+    if any(a >= b for a, b in zip(Ns, Ns[1:])):
+        raise ValueError(f"Las resoluciones deben ser estrictamente crecientes: {list(Ns)}")
+    h = [1.0 / (N - 1) for N in Ns]
+    tabla = [funcion_N(N) for N in Ns]
+    for j in range(1, len(Ns)):
+        anterior = tabla[-1]
+        tabla = tabla[:j] + [tabla[k] + (tabla[k] - tabla[k - 1]) / (h[k - j] / h[k] - 1)
+                             for k in range(j, len(Ns))]
+    # Diferencia con la mejor estimación de la columna previa: cota conservadora
+    error = np.linalg.norm(tabla[-1] - anterior, axis=1)
+    return tabla[-1], error
+
+
+def resoluciones(N, niveles=2):
+    """
+    Resoluciones con paso h, h/2, h/4, ... a partir de N elementos.
+    """
+    return [(N - 1) * 2**k + 1 for k in range(niveles)]
+
+
+def campo_alambre_richardson(I, L, N, r_puntos, z_offset=0, niveles=2, nucleo='numpy'):
+    """
+    Campo del alambre extrapolado a partir de N, 2N-1, ... elementos.
+
+    Returns:
+        B: Campo extrapolado (n, 3)
+        error: Estimación del error por punto (n,), en T
+    """
+    return extrapolar_richardson(
+        lambda n: campo_alambre(I, L, n, r_puntos, z_offset, nucleo), resoluciones(N, niveles))
+
+
+def campo_espira_richardson(I, a, N, r_puntos, z_offset=0, niveles=2, nucleo='numpy'):
+    """
+    Campo de la espira extrapolado a partir de N, 2N-1, ... elementos.
+
+    Returns:
+        B: Campo extrapolado (n, 3)
+        error: Estimación del error por punto (n,), en T
+    """
+    return extrapolar_richardson(
+        lambda n: campo_espira(I, a, n, r_puntos, z_offset, nucleo), resoluciones(N, niveles))
+
+
+def error_cuadratura(funcion_N, N, B_N=None):
+    """
+    Estima el error relativo por punto del campo calculado con N elementos.
+
+    Usa una resolución adicional de N/2 elementos, por lo que cuesta 1.5
+    veces el cálculo original. Con dos niveles, el error devuelto por
+    extrapolar_richardson es justamente |B(N) - B_extrapolado|.
+
+    Args:
+        funcion_N: Función n -> B (n_puntos, 3)
+        N: Elementos del cálculo cuyo error se estima
+        B_N: funcion_N(N) si ya se calculó; así sólo se agrega el costo de N/2
+
+    Returns:
+        B: Campo extrapolado (n, 3)
+        error: Error relativo estimado por punto del resultado con N elementos (n,)
+    """
+    calcular = funcion_N if B_N is None else (lambda n: B_N if n == N else funcion_N(n))
+    B, error = extrapolar_richardson(calcular, [(N + 1) // 2, N])
+    B_mag = np.linalg.norm(B, axis=1)
+    return B, error / np.where(B_mag > 0, B_mag, 1)
@@ -0,0 +1,26 @@
+import numpy as np
+from .alambre import mu0
+from .nucleos import obtener_nucleo
+
+def campo_espira(I, a, N, r_puntos, z_offset=0, nucleo='numpy'):
+    thetas = np.linspace(0, 2*np.pi, N)
+    dtheta = thetas[1] - thetas[0]
+
+    r_prima = np.c_[a*np.cos(thetas), a*np.sin(thetas), np.full(N, z_offset)]
+    dl = np.c_[-a*np.sin(thetas)*dtheta, a*np.cos(thetas)*dtheta, np.zeros(N)]
+
+    return mu0 * I / (4*np.pi) * obtener_nucleo(nucleo)(r_puntos, r_prima, dl)
+
+def potencial_espira(I, a, N, r_puntos, z_offset=0, nucleo='numpy'):
+    thetas = np.linspace(0, 2*np.pi, N)
+    dtheta = thetas[1] - thetas[0]
+
+    r_prima = np.c_[a*np.cos(thetas), a*np.sin(thetas), np.full(N, z_offset)]
+    dl = np.c_[-a*np.sin(thetas)*dtheta, a*np.cos(thetas)*dtheta, np.zeros(N)]
+
+    return mu0 * I / (4*np.pi) * obtener_nucleo(nucleo, 'potencial')(r_puntos, r_prima, dl)
+
+def distancia_espira(r_puntos, a, z_offset=0):
+    # Distancia de cada punto a la circunferencia de la espira
+    rho = np.sqrt(r_puntos[:, 0]**2 + r_puntos[:, 1]**2)
+    return np.sqrt((rho - a)**2 + (r_puntos[:, 2] - z_offset)**2)
@@ -0,0 +1,242 @@
+import contextlib
+import io
+import json
+import os
+import zipfile
+
+import numpy as np
+from .campo_streaming import TAM_BLOQUE, bloques_malla
+
+FORMATOS = ('vti', 'vts', 'npz', 'bin')
+
+
+def _bloques(B, tam_bloque=TAM_BLOQUE):
+    # Recorre B (n, 3) por bloques; sirve igual para arrays en RAM o memmaps
+    B = B.reshape(-1, 3)
+    for i0 in range(0, len(B), tam_bloque):
+        yield np.ascontiguousarray(B[i0:i0 + tam_bloque], dtype='<f8')
+
+
+def _modulo(B, tam_bloque=TAM_BLOQUE):
+    for bloque in _bloques(B, tam_bloque):
+        yield np.linalg.norm(bloque, axis=1)
+
+
+def _puntos(x, y, z, tam_bloque=TAM_BLOQUE):
+    # Coordenadas de la malla en el orden de puntos_malla (x más rápido), por bloques
+    for r in bloques_malla(x, y, z, tam_bloque):
+        yield np.ascontiguousarray(r, dtype='<f8')
+
+
+def _validar(x, y, z, B):
+    n_puntos = len(x) * len(y) * len(z)
+    if B.size != 3 * n_puntos:
+        raise ValueError(f"B tiene {B.size // 3} puntos, la malla tiene {n_puntos}")
+
+
+@contextlib.contextmanager
+def _abrir(destino):
+    # Permite escribir tanto a una ruta como a un archivo ya abierto (p. ej. BytesIO)
+    if isinstance(destino, (str, os.PathLike)):
+        with open(destino, 'wb') as f:
+            yield f
+    else:
+        yield destino
+
+
+def _escribir_vtk(destino, tipo, atributos_malla, extent, arreglos, con_puntos):
+    """
+    Escribe un archivo VTK XML con los datos en una sección 'appended' cruda.
+
+    arreglos es una lista de (nombre, n_componentes, n_bytes, generador de bloques);
+    los datos se escriben bloque a bloque, sin armar el archivo en memoria.
+    """
+    offset = 0
+    declaraciones = []
+    for nombre, n_comp, n_bytes, _ in arreglos:
+        declaraciones.append(
+            f'<DataArray type="Float64" Name="{nombre}" NumberOfComponents="{n_comp}" '
+            f'format="appended" offset="{offset}"/>')
+        offset += 8 + n_bytes
+
+    n_datos = len(arreglos) - 1 if con_puntos else len(arreglos)
+    datos_punto = '\n        '.join(declaraciones[:n_datos])
+    encabezado = (
+        '<?xml version="1.0"?>\n'
+        f'<VTKFile type="{tipo}" version="1.0" byte_order="LittleEndian" header_type="UInt64">\n'
+        f'  <{tipo} {atributos_malla}>\n'
+        f'    <Piece Extent="{extent}">\n'
+        '      <PointData Vectors="B" Scalars="B_modulo">\n'
+        f'        {datos_punto}\n'
+        '      </PointData>\n')
+    if con_puntos:
+        encabezado += f'      <Points>\n        {declaraciones[-1]}\n      </Points>\n'
+    encabezado += (
+        '    </Piece>\n'
+        f'  </{tipo}>\n'
+        '  <AppendedData encoding="raw">\n   _')
+
+    with _abrir(destino) as f:
+        f.write(encabezado.encode('ascii'))
+        for _, _, n_bytes, bloques in arreglos:
+            f.write(np.uint64(n_bytes).astype('<u8').tobytes())
+            for bloque in bloques:
+                f.write(bloque.tobytes())
+        f.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+
+def exportar_vti(destino, x, y, z, B):
+    """
+    Exporta el campo a una malla estructurada uniforme de VTK (.vti).
+
+    Args:
+        destino: Ruta o archivo binario abierto
+        x, y, z: Ejes de la malla (arrays 1D equiespaciados)
+        B: Campo (nz*ny*nx, 3) en orden x más rápido, p. ej. la salida
+           de evaluar_malla_en_disco
+
+    Raises:
+        ValueError: Si algún eje no es equiespaciado
+    """
+    _validar(x, y, z, B)
+    espaciado = []
+    for eje in (x, y, z):
+        paso = np.diff(eje)
+        if len(paso) and not np.allclose(paso, paso[0]):
+            raise ValueError("La malla no es uniforme; use exportar_vts")
+        espaciado.append(paso[0] if len(paso) else 1.0)
+
+    nx, ny, nz = len(x), len(y), len(z)
+    extent = f"0 {nx - 1} 0 {ny - 1} 0 {nz - 1}"
+    atributos = (f'WholeExtent="{extent}" Origin="{x[0]} {y[0]} {z[0]}" '
+                 f'Spacing="{espaciado[0]} {espaciado[1]} {espaciado[2]}"')
+    n = nx * ny * nz
+    _escribir_vtk(destino, 'ImageData', atributos, extent, [
+        ('B', 3, 24 * n, _bloques(B)),
+        ('B_modulo', 1, 8 * n, _modulo(B)),
+    ], con_puntos=False)
+
+
+def exportar_vts(destino, x, y, z, B):
+    """
+    Exporta el campo a una malla estructurada general de VTK (.vts).
+
+    A diferencia de .vti, admite ejes con espaciado no uniforme.
+
+    Args:
+        destino: Ruta o archivo binario abierto
+        x, y, z: Ejes de la malla (arrays 1D)
+        B: Campo (nz*ny*nx, 3) en orden x más rápido
+    """
+    _validar(x, y, z, B)
+    nx, ny, nz = len(x), len(y), len(z)
+    extent = f"0 {nx - 1} 0 {ny - 1} 0 {nz - 1}"
+    n = nx * ny * nz
+    _escribir_vtk(destino, 'StructuredGrid', f'WholeExtent="{extent}"', extent, [
+        ('B', 3, 24 * n, _bloques(B)),
+        ('B_modulo', 1, 8 * n, _modulo(B)),
+        ('Points', 3, 24 * n, _puntos(x, y, z)),
+    ], con_puntos=True)
+
+
+def exportar_npz(destino, x, y, z, B):
+    """
+    Exporta el campo a un .npz comprimido con los ejes y B de forma (nz, ny, nx, 3).
+
+    B se comprime por bloques, por lo que puede provenir de un memmap mayor que la RAM.
+
+    Args:
+        destino: Ruta o archivo binario abierto
+        x, y, z: Ejes de la malla (arrays 1D)
+        B: Campo (nz*ny*nx, 3) en orden x más rápido
+    """
+    _validar(x, y, z, B)
+    forma = (len(z), len(y), len(x), 3)
+    with _abrir(destino) as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for nombre, eje in (('x', x), ('y', y), ('z', z)):
+            with zf.open(f'{nombre}.npy', 'w') as arch:
+                np.lib.format.write_array(arch, np.asarray(eje, dtype='<f8'))
+        with zf.open('B.npy', 'w', force_zip64=True) as arch:
+            np.lib.format.write_array_header_1_0(arch, {
+                'descr': '<f8', 'fortran_order': False, 'shape': forma})
+            for bloque in _bloques(B):
+                arch.write(bloque.tobytes())
+
+
+def exportar_binario(ruta, x, y, z, B):
+    """
+    Exporta el campo como binario crudo más un encabezado JSON ('<ruta>.json').
+
+    El formato permite recargar sin copias con cargar_binario (np.memmap).
+
+    Args:
+        ruta: Archivo binario de salida
+        x, y, z: Ejes de la malla (arrays 1D)
+        B: Campo (nz*ny*nx, 3) en orden x más rápido
+    """
+    _validar(x, y, z, B)
+    with open(ruta, 'wb') as f:
+        for bloque in _bloques(B):
+            f.write(bloque.tobytes())
+    encabezado = {
+        'dtype': '<f8',
+        'shape': [len(z), len(y), len(x), 3],
+        'orden': 'C',
+        'x': np.asarray(x, dtype=float).tolist(),
+        'y': np.asarray(y, dtype=float).tolist(),
+        'z': np.asarray(z, dtype=float).tolist(),
+    }
+    with open(os.fspath(ruta) + '.json', 'w') as f:
+        json.dump(encabezado, f)
+
+
+def cargar_binario(ruta):
+    """
+    Carga un campo exportado con exportar_binario sin leerlo a memoria.
+
+    Returns:
+        x, y, z: Ejes de la malla
+        B: np.memmap de sólo lectura con forma (nz, ny, nx, 3)
+    """
+    with open(os.fspath(ruta) + '.json') as f:
+        encabezado = json.load(f)
+    B = np.memmap(ruta, dtype=encabezado['dtype'], mode='r',
+                  shape=tuple(encabezado['shape']), order=encabezado['orden'])
+    return np.array(encabezado['x']), np.array(encabezado['y']), np.array(encabezado['z']), B
+
+
+def exportar_campo(destino, x, y, z, B, formato=None):
+    """
+    Exporta el campo en el formato indicado o deducido de la extensión.
+
+    Args:
+        destino: Ruta (o archivo abierto, salvo para 'bin')
+        x, y, z: Ejes de la malla (arrays 1D)
+        B: Campo (nz*ny*nx, 3) en orden x más rápido
+        formato: Uno de FORMATOS; si es None se usa la extensión de destino
+    """
+    if formato is None:
+        formato = os.path.splitext(str(destino))[1].lstrip('.').lower()
+    exportadores = {
+        'vti': exportar_vti,
+        'vts': exportar_vts,
+        'npz': exportar_npz,
+        'bin': exportar_binario,
+    }
+    if formato not in exportadores:
+        raise ValueError(f"Formato desconocido '{formato}'; opciones: {', '.join(FORMATOS)}")
+    exportadores[formato](destino, x, y, z, B)
+
+
+def exportar_a_bytes(x, y, z, B, formato):
+    """
+    Exporta el campo a memoria, p. ej. para un botón de descarga.
+
+    Returns:
+        datos: Contenido del archivo en bytes
+    """
+    if formato == 'bin':
+        raise ValueError("El formato 'bin' requiere dos archivos; exporte a disco")
+    buffer = io.BytesIO()
+    exportar_campo(buffer, x, y, z, B, formato)
+    return buffer.getvalue()
@@ -1,5 +1,3 @@
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
 def graficar_2d(x, y, Bx, By, titulo="Campo Magnético", geometria=None):
@@ -12,6 +10,8 @@ def graficar_2d(x, y, Bx, By, titulo="Campo Magnético", geometria=None):
         titulo: Título del gráfico
         geometria: dict con 'tipo' ('alambre', 'espira', 'ambos') y parámetros
     """
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(8, 8))
     
     # Normalizar vectores para mejor visualización
@@ -50,6 +50,19 @@ def graficar_2d(x, y, Bx, By, titulo="Campo Magnético", geometria=None):
         plt.legend()
     plt.show()
 
+def _dibujar_geometria_3d(ax, geometria):
+    if geometria:
+        if geometria['tipo'] == 'alambre' or geometria['tipo'] == 'ambos':
+            L = geometria.get('L', 2)
+            zs = np.linspace(-L/2, L/2, 50)
+            ax.plot([0]*len(zs), [0]*len(zs), zs, 'r-', linewidth=3, label='Alambre')
+        
+        if geometria['tipo'] == 'espira' or geometria['tipo'] == 'ambos':
+            a = geometria.get('a', 0.5)
+            theta = np.linspace(0, 2*np.pi, 100)
+            ax.plot(a*np.cos(theta), a*np.sin(theta), [0]*len(theta), 
+                   'b-', linewidth=3, label='Espira')
+
 def graficar_3d(x, y, z, Bx, By, Bz, titulo="Campo Magnético 3D", geometria=None):
     """
     Grafica campo magnético en 3D con vectores.
@@ -60,6 +73,8 @@ def graficar_3d(x, y, z, Bx, By, Bz, titulo="Campo Magnético 3D", geometria=Non
         titulo: Título del gráfico
         geometria: dict con 'tipo' ('alambre', 'espira', 'ambos') y parámetros
     """
+    import matplotlib.pyplot as plt
+    
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
     
@@ -82,17 +97,43 @@ def graficar_3d(x, y, z, Bx, By, Bz, titulo="Campo Magnético 3D", geometria=Non
                   cmap='viridis', linewidth=1.5)
     
     # Dibujar geometría
+    _dibujar_geometria_3d(ax, geometria)
+    
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('y (m)')
+    ax.set_zlabel('z (m)')
+    ax.set_title(titulo)
     if geometria:
-        if geometria['tipo'] == 'alambre' or geometria['tipo'] == 'ambos':
-            L = geometria.get('L', 2)
-            zs = np.linspace(-L/2, L/2, 50)
-            ax.plot([0]*len(zs), [0]*len(zs), zs, 'r-', linewidth=3, label='Alambre')
-        
-        if geometria['tipo'] == 'espira' or geometria['tipo'] == 'ambos':
-            a = geometria.get('a', 0.5)
-            theta = np.linspace(0, 2*np.pi, 100)
-            ax.plot(a*np.cos(theta), a*np.sin(theta), [0]*len(theta), 
-                   'b-', linewidth=3, label='Espira')
+        ax.legend()
+    plt.show()
+
+def graficar_trayectorias(trayectorias, titulo="Trayectorias de Partículas", geometria=None):
+    """
+    Grafica las trayectorias de muchas partículas como una sola colección de líneas.
+    
+    Args:
+        trayectorias: Array (n_t, n, 3) de empujar_particulas (NaN = perdida)
+        titulo: Título del gráfico
+        geometria: dict con 'tipo' ('alambre', 'espira', 'ambos') y parámetros
+    """
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+    
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
+    
+    # Una sola colección con todos los segmentos válidos (sin NaN en los extremos)
+    segmentos = np.stack([trayectorias[:-1], trayectorias[1:]], axis=2).reshape(-1, 2, 3)
+    segmentos = segmentos[~np.isnan(segmentos).any(axis=(1, 2))]
+    ax.add_collection3d(Line3DCollection(segmentos, colors='orange', linewidths=0.8))
+    
+    if len(segmentos):
+        puntos = segmentos.reshape(-1, 3)
+        ax.set_xlim(puntos[:, 0].min(), puntos[:, 0].max())
+        ax.set_ylim(puntos[:, 1].min(), puntos[:, 1].max())
+        ax.set_zlim(puntos[:, 2].min(), puntos[:, 2].max())
+    
+    _dibujar_geometria_3d(ax, geometria)
     
     ax.set_xlabel('x (m)')
     ax.set_ylabel('y (m)')
@@ -0,0 +1,224 @@
+"""
+Flujo magnético a través de superficies e integrales de línea sobre caminos.
+
+Las superficies y caminos son funciones paramétricas:
+
+    camino:     t (m,)    -> r (m, 3), dr/dt (m, 3)          t en [0, 1]
+    superficie: u, v (m,) -> r (m, 3), dA/(du dv) (m, 3)     u, v en [0, 1]
+
+Un camino también puede ser una lista de tramos (p. ej. los lados de un
+polígono), y cada tramo se integra por separado para no cruzar esquinas con
+una misma regla. La orientación sigue la regla de la mano derecha: el borde
+de una superficie se recorre en sentido antihorario visto desde su normal.
+
+Cada integral usa cuadratura de Gauss-Legendre con n y con 2n nodos. Los
+nodos de las dos reglas se evalúan juntos en una sola llamada a la función de
+campo, y se devuelve el valor con 2n nodos junto con |Q_2n - Q_n| como
+estimación del error.
+"""
+import numpy as np
+
+
+def _gauss(n):
+    # Nodos y pesos de Gauss-Legendre en [0, 1]
+    t, w = np.polynomial.legendre.leggauss(n)
+    return (t + 1) / 2, w / 2
+
+
+def _base_ortonormal(normal):
+    # Dos vectores unitarios e1, e2 con e1 x e2 = normal
+    n = np.asarray(normal, dtype=float)
+    n = n / np.linalg.norm(n)
+    a = np.array([1.0, 0, 0]) if abs(n[0]) < 0.9 else np.array([0, 1.0, 0])
+    e1 = a - np.dot(a, n) * n
+    e1 /= np.linalg.norm(e1)
+    return n, e1, np.cross(n, e1)
+
+
+def _integrar(funcion, reglas):
+    """
+    Suma sum_k F(r_k) . w_k para cada regla con una sola evaluación de F.
+
+    Args:
+        funcion: Función r_puntos (m, 3) -> F (m, 3)
+        reglas: Lista [(puntos (m, 3), pesos vectoriales (m, 3))], de la más
+                gruesa a la más fina
+
+    Returns:
+        valor: Resultado de la regla más fina
+        error: |diferencia entre la regla más fina y la más gruesa|
+    """
+    F = funcion(np.concatenate([p for p, _ in reglas]))
+    valores, inicio = [], 0
+    for p, w in reglas:
+        valores.append(np.sum(F[inicio:inicio + len(p)] * w))
+        inicio += len(p)
+    return valores[-1], abs(valores[-1] - valores[0])
+
+
+def camino_circulo(radio, centro=(0, 0, 0), normal=(0, 0, 1)):
+    """
+    Circunferencia recorrida en sentido antihorario alrededor de 'normal'.
+    """
+    c = np.asarray(centro, dtype=float)
+    _, e1, e2 = _base_ortonormal(normal)
+
+    def camino(t):
+        th = 2*np.pi*t[:, None]
+        r = c + radio * (np.cos(th)*e1 + np.sin(th)*e2)
+        dr = 2*np.pi*radio * (-np.sin(th)*e1 + np.cos(th)*e2)
+        return r, dr
+    return camino
+
+
+def camino_poligono(vertices, cerrado=True):
+    """
+    Poligonal por los vértices dados (array (k, 3)), un tramo por lado.
+
+    Returns:
+        tramos: Lista de caminos, uno por segmento
+    """
+    v = np.asarray(vertices, dtype=float)
+    if cerrado:
+        v = np.vstack([v, v[:1]])
+
+    def segmento(p, q):
+        def camino(t):
+            return p + t[:, None]*(q - p), np.broadcast_to(q - p, (len(t), 3))
+        return camino
+    return [segmento(v[k], v[k + 1]) for k in range(len(v) - 1)]
+
+
+def superficie_disco(radio, centro=(0, 0, 0), normal=(0, 0, 1)):
+    """
+    Disco plano; su borde orientado es camino_circulo(radio, centro, normal).
+    """
+    c = np.asarray(centro, dtype=float)
+    n, e1, e2 = _base_ortonormal(normal)
+
+    def superficie(u, v):
+        # u radial, v angular: dA = 2 pi R^2 u du dv en la dirección normal
+        th = 2*np.pi*v[:, None]
+        r = c + radio*u[:, None] * (np.cos(th)*e1 + np.sin(th)*e2)
+        return r, 2*np.pi*radio**2 * u[:, None] * n
+    return superficie
+
+
+def superficie_rectangulo(esquina, lado_u, lado_v):
+    """
+    Paralelogramo esquina + u lado_u + v lado_v, con normal lado_u x lado_v.
+    Su borde orientado es borde_rectangulo con los mismos argumentos.
+    """
+    p0, lu, lv = (np.asarray(a, dtype=float) for a in (esquina, lado_u, lado_v))
+    dA = np.cross(lu, lv)
+
+    def superficie(u, v):
+        return p0 + u[:, None]*lu + v[:, None]*lv, np.broadcast_to(dA, (len(u), 3))
+    return superficie
+
+
+def borde_rectangulo(esquina, lado_u, lado_v):
+    p0, lu, lv = (np.asarray(a, dtype=float) for a in (esquina, lado_u, lado_v))
+    return camino_poligono([p0, p0 + lu, p0 + lu + lv, p0 + lv])
+
+
+def integral_linea(funcion_campo, camino, n=64):
+    """
+    Integral de línea ∫ F · dl a lo largo de un camino.
+
+    Con funcion_campo = B y un camino cerrado da la circulación de la Ley de
+    Ampère (mu0 por la corriente encerrada).
+
+    Args:
+        funcion_campo: Función r_puntos (m, 3) -> F (m, 3)
+        camino: Camino paramétrico o lista de tramos
+        n: Nodos de Gauss por tramo de la regla gruesa
+
+    Returns:
+        valor: Integral estimada
+        error: Estimación del error de cuadratura
+    """
+    tramos = camino if isinstance(camino, (list, tuple)) else [camino]
+    reglas = []
+    for m in (n, 2*n):
+        t, w = _gauss(m)
+        puntos, pesos = [], []
+        for tramo in tramos:
+            r, dr = tramo(t)
+            puntos.append(r)
+            pesos.append(w[:, None] * dr)
+        reglas.append((np.concatenate(puntos), np.concatenate(pesos)))
+    return _integrar(funcion_campo, reglas)
+
+
+def flujo(funcion_campo, superficie, n=16):
+    """
+    Flujo ∬ B · dA a través de una superficie paramétrica.
+
+    Usa una regla de Gauss-Legendre producto de n x n nodos (y de 2n x 2n para
+    el error), así que cuesta 5 n^2 evaluaciones del campo.
+
+    Args:
+        funcion_campo: Función r_puntos (m, 3) -> B (m, 3)
+        superficie: Superficie paramétrica (superficie_disco, superficie_rectangulo, ...)
+        n: Nodos de Gauss por dirección de la regla gruesa
+
+    Returns:
+        valor: Flujo estimado (Wb si B está en T)
+        error: Estimación del error de cuadratura
+    """
+    reglas = []
+    for m in (n, 2*n):
+        t, w = _gauss(m)
+        u, v = (a.ravel() for a in np.meshgrid(t, t, indexing='ij'))
+        r, dA = superficie(u, v)
+        reglas.append((r, np.outer(w, w).ravel()[:, None] * dA))
+    return _integrar(funcion_campo, reglas)
+
+
+def flujo_por_potencial(funcion_potencial, borde, n=64):
+    """
+    Flujo a través de una superficie como la circulación ∮ A · dl de su borde.
+
+    Por el teorema de Stokes da lo mismo que flujo(), pero sólo necesita
+    evaluar A sobre un camino: 3n puntos en vez de los 5n^2 de flujo(). Con
+    los potenciales de potencial_escena (que usan el mismo núcleo que
+    campo_escena) la igualdad es exacta salvo cuadratura, porque cada
+    elemento de corriente cumple B = rot A.
+
+    Args:
+        funcion_potencial: Función r_puntos (m, 3) -> A (m, 3)
+        borde: Borde orientado de la superficie (camino o lista de tramos)
+        n: Nodos de Gauss por tramo de la regla gruesa
+
+    Returns:
+        valor, error: Como en integral_linea
+    """
+    return integral_linea(funcion_potencial, borde, n)
+
+
+def flujo_malla(funcion_campo, vertices, triangulos):
+    """
+    Flujo a través de una malla de triángulos.
+
+    Se integra con la regla de los puntos medios de los lados (exacta para
+    campos cuadráticos en cada triángulo) y el error se estima comparándola
+    con la del baricentro. Para mejorar la precisión hay que refinar la malla.
+
+    Args:
+        funcion_campo: Función r_puntos (m, 3) -> B (m, 3)
+        vertices: Array (k, 3) de vértices
+        triangulos: Array (t, 3) de índices; la normal de cada triángulo sigue
+                    el orden de sus vértices (regla de la mano derecha)
+
+    Returns:
+        valor, error: Como en flujo
+    """
+    v = np.asarray(vertices, dtype=float)[np.asarray(triangulos)]
+    p0, p1, p2 = v[:, 0], v[:, 1], v[:, 2]
+    dA = 0.5 * np.cross(p1 - p0, p2 - p0)
+
+    baricentro = ((p0 + p1 + p2) / 3, dA)
+    medios = (np.concatenate([(p0 + p1) / 2, (p1 + p2) / 2, (p2 + p0) / 2]),
+              np.tile(dA / 3, (3, 1)))
+    return _integrar(funcion_campo, [baricentro, medios])
@@ -0,0 +1,48 @@
+import argparse
+
+import numpy as np
+from .campo_streaming import TAM_BLOQUE, campo_escena, evaluar_malla_en_disco
+from .exportacion import FORMATOS, exportar_campo
+
+
+def _eje(texto):
+    inicio, fin, n = texto.split(':')
+    return np.linspace(float(inicio), float(fin), int(n))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Cálculo por bloques del campo magnético sobre una malla 3D")
+    parser.add_argument('salida', help="Archivo .npy de salida")
+    parser.add_argument('--x', type=_eje, default='-1.5:1.5:50', help="inicio:fin:n")
+    parser.add_argument('--y', type=_eje, default='-1.5:1.5:50', help="inicio:fin:n")
+    parser.add_argument('--z', type=_eje, default='-1.5:1.5:50', help="inicio:fin:n")
+    parser.add_argument('--I-alambre', type=float, default=10.0)
+    parser.add_argument('--L-alambre', type=float, default=2.0)
+    parser.add_argument('--z-alambre', type=float, default=0.0)
+    parser.add_argument('--I-espira', type=float, default=5.0)
+    parser.add_argument('--a-espira', type=float, default=0.5)
+    parser.add_argument('--z-espira', type=float, default=0.0)
+    parser.add_argument('--N', type=int, default=1000, help="Elementos de corriente")
+    parser.add_argument('--nucleo', default='auto', help="Núcleo de cálculo: numpy, numba o auto")
+    parser.add_argument('--bloque', type=int, default=TAM_BLOQUE, help="Puntos por bloque")
+    parser.add_argument('--desde-cero', action='store_true', help="No reanudar corridas previas")
+    parser.add_argument('--exportar', action='append', default=[], metavar='ARCHIVO',
+                        help=f"Exporta además el resultado ({', '.join(FORMATOS)}); se puede repetir")
+    args = parser.parse_args(argv)
+
+    escena = dict(I_alambre=args.I_alambre, L_alambre=args.L_alambre, I_espira=args.I_espira,
+                  a_espira=args.a_espira, N=args.N, z_offset_alambre=args.z_alambre,
+                  z_offset_espira=args.z_espira, nucleo=args.nucleo)
+    # Con otros parámetros no se reanuda: se empieza de cero
+    B = evaluar_malla_en_disco(campo_escena(**escena), args.x, args.y, args.z, args.salida,
+                               tam_bloque=args.bloque, reanudar=not args.desde_cero, clave=escena)
+    print(f"Campo guardado en {args.salida}: {B.shape[0]} puntos")
+    for destino in args.exportar:
+        exportar_campo(destino, args.x, args.y, args.z, B)
+        print(f"Exportado a {destino}")
+    return B
+
+
+if __name__ == '__main__':
+    main()
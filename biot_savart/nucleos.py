@@ -0,0 +1,230 @@
+"""
+Núcleos de cálculo intercambiables para la suma de Biot-Savart.
+
+Un núcleo recibe los puntos de evaluación r_puntos (P, 3), las posiciones de
+los elementos de corriente r_prima (M, 3) y sus vectores dl (M, 3), y devuelve
+la suma geométrica
+
+    S(r) = sum_j dl_j x (r - r'_j) / |r - r'_j|^3        (P, 3)    tipo 'campo'
+    S(r) = sum_j dl_j / |r - r'_j|                        (P, 3)    tipo 'potencial'
+
+El factor mu0 I / (4 pi) lo aplica quien llama (campo_alambre, campo_espira,
+potencial_alambre, potencial_espira).
+"""
+import os
+import threading
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def _crear_numpy():
+    def nucleo(r_puntos, r_prima, dl):
+        # Un elemento de corriente por vez: la memoria queda en O(P)
+        S = np.zeros(r_puntos.shape, dtype=np.float64)
+        for rp, d in zip(r_prima, dl):
+            R = r_puntos - rp
+            R_norm = np.linalg.norm(R, axis=1).reshape(-1, 1)
+            S += np.cross(d, R) / (R_norm**3)
+        return S
+    return nucleo
+
+
+def _crear_numpy_potencial():
+    def nucleo(r_puntos, r_prima, dl):
+        S = np.zeros(r_puntos.shape, dtype=np.float64)
+        for rp, d in zip(r_prima, dl):
+            S += d / np.linalg.norm(r_puntos - rp, axis=1).reshape(-1, 1)
+        return S
+    return nucleo
+
+
+@contextmanager
+def _capas_preferidas(numba):
+    # TBB se cuelga al salir si el primer lanzamiento ocurre fuera del hilo
+    # principal (Streamlit, el servicio), así que se prefiere OpenMP o workqueue
+    # salvo que el usuario haya elegido una capa explícitamente. La preferencia
+    # se restaura al terminar para no afectar a otro código de Numba.
+    if any(v in os.environ for v in ('NUMBA_THREADING_LAYER', 'NUMBA_THREADING_LAYER_PRIORITY')):
+        yield
+        return
+    anterior = numba.config.THREADING_LAYER_PRIORITY
+    numba.config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+    try:
+        yield
+    finally:
+        numba.config.THREADING_LAYER_PRIORITY = anterior
+
+
+# workqueue no admite lanzamientos simultáneos desde varios hilos: un solo
+# cerrojo para todos los núcleos de Numba
+_cerrojo_numba = threading.Lock()
+_numba_lanzado = []
+
+
+def _lanzar_numba(numba, funcion, *args):
+    args = tuple(np.ascontiguousarray(a, dtype=np.float64) for a in args)
+    with _cerrojo_numba:
+        if _numba_lanzado:
+            return funcion(*args)
+        # La capa de hilos se elige en el primer lanzamiento paralelo del proceso
+        with _capas_preferidas(numba):
+            S = funcion(*args)
+        _numba_lanzado.append(True)
+        return S
+
+
+def _crear_numba():
+    import numba
+
+    # error_model='numpy': en el propio conductor da inf/nan como NumPy, sin excepción
+    @numba.njit(parallel=True, error_model='numpy', cache=True)
+    def _suma(r_puntos, r_prima, dl):
+        P, M = r_puntos.shape[0], r_prima.shape[0]
+        S = np.empty((P, 3))
+        for i in numba.prange(P):
+            x, y, z = r_puntos[i, 0], r_puntos[i, 1], r_puntos[i, 2]
+            sx = sy = sz = 0.0
+            # Diferencia, norma, producto vectorial y acumulación en una sola pasada
+            for j in range(M):
+                Rx = x - r_prima[j, 0]
+                Ry = y - r_prima[j, 1]
+                Rz = z - r_prima[j, 2]
+                R2 = Rx*Rx + Ry*Ry + Rz*Rz
+                inv = 1.0 / (R2 * np.sqrt(R2))
+                sx += (dl[j, 1]*Rz - dl[j, 2]*Ry) * inv
+                sy += (dl[j, 2]*Rx - dl[j, 0]*Rz) * inv
+                sz += (dl[j, 0]*Ry - dl[j, 1]*Rx) * inv
+            S[i, 0] = sx
+            S[i, 1] = sy
+            S[i, 2] = sz
+        return S
+
+    def nucleo(r_puntos, r_prima, dl):
+        return _lanzar_numba(numba, _suma, r_puntos, r_prima, dl)
+    return nucleo
+
+
+def _crear_numba_potencial():
+    import numba
+
+    @numba.njit(parallel=True, error_model='numpy', cache=True)
+    def _suma(r_puntos, r_prima, dl):
+        P, M = r_puntos.shape[0], r_prima.shape[0]
+        S = np.empty((P, 3))
+        for i in numba.prange(P):
+            x, y, z = r_puntos[i, 0], r_puntos[i, 1], r_puntos[i, 2]
+            sx = sy = sz = 0.0
+            for j in range(M):
+                Rx = x - r_prima[j, 0]
+                Ry = y - r_prima[j, 1]
+                Rz = z - r_prima[j, 2]
+                inv = 1.0 / np.sqrt(Rx*Rx + Ry*Ry + Rz*Rz)
+                sx += dl[j, 0] * inv
+                sy += dl[j, 1] * inv
+                sz += dl[j, 2] * inv
+            S[i, 0] = sx
+            S[i, 1] = sy
+            S[i, 2] = sz
+        return S
+
+    def nucleo(r_puntos, r_prima, dl):
+        return _lanzar_numba(numba, _suma, r_puntos, r_prima, dl)
+    return nucleo
+
+
+# Nombre -> función que construye el núcleo (se llama recién al pedirlo)
+_FABRICAS = {
+    'numpy': _crear_numpy,
+    'numba': _crear_numba,
+}
+_FABRICAS_POTENCIAL = {
+    'numpy': _crear_numpy_potencial,
+    'numba': _crear_numba_potencial,
+}
+_TIPOS = {'campo': _FABRICAS, 'potencial': _FABRICAS_POTENCIAL}
+# Claves (tipo, nombre)
+_cargados = {}
+_fallidos = {}
+_avisados = set()
+
+
+def _cargar(nombre, tipo='campo'):
+    clave = (tipo, nombre)
+    if clave in _fallidos:
+        raise ImportError(_fallidos[clave])
+    if clave not in _cargados:
+        try:
+            if nombre not in _TIPOS[tipo]:
+                raise ImportError(f"no define un núcleo de tipo '{tipo}'")
+            _cargados[clave] = _TIPOS[tipo][nombre]()
+        except ImportError as e:
+            _fallidos[clave] = str(e)
+            raise
+    return _cargados[clave]
+
+
+def registrar_nucleo(nombre, fabrica, fabrica_potencial=None):
+    """
+    Registra un núcleo nuevo.
+
+    Args:
+        nombre: Nombre con el que se lo pide en campo_alambre/campo_espira
+        fabrica: Función sin argumentos que devuelve el núcleo; puede lanzar
+                 ImportError si falta alguna dependencia opcional
+        fabrica_potencial: Ídem para el núcleo del potencial vector (opcional;
+                           sin ella los potenciales usan el de NumPy)
+    """
+    _FABRICAS[nombre] = fabrica
+    if fabrica_potencial is None:
+        _FABRICAS_POTENCIAL.pop(nombre, None)
+    else:
+        _FABRICAS_POTENCIAL[nombre] = fabrica_potencial
+    for tipo in _TIPOS:
+        _cargados.pop((tipo, nombre), None)
+        _fallidos.pop((tipo, nombre), None)
+        _avisados.discard((tipo, nombre))
+
+
+def obtener_nucleo(nombre='numpy', tipo='campo'):
+    """
+    Devuelve el núcleo pedido, o el de NumPy si no se puede cargar.
+
+    'auto' elige 'numba' si está instalado y 'numpy' si no.
+
+    Args:
+        nombre: Nombre del núcleo
+        tipo: 'campo' (suma de Biot-Savart) o 'potencial' (potencial vector)
+
+    Raises:
+        ValueError: Si el nombre no corresponde a ningún núcleo registrado
+    """
+    if tipo not in _TIPOS:
+        raise ValueError(f"Tipo de núcleo desconocido '{tipo}'; opciones: {', '.join(_TIPOS)}")
+    if nombre == 'auto':
+        nombre = 'numba' if 'numba' in nucleos_disponibles() else 'numpy'
+    if nombre not in _FABRICAS:
+        raise ValueError(f"Núcleo desconocido '{nombre}'; opciones: {', '.join(_FABRICAS)}")
+    try:
+        return _cargar(nombre, tipo)
+    except ImportError as e:
+        # Se avisa sólo la primera vez que falla
+        if (tipo, nombre) not in _avisados:
+            _avisados.add((tipo, nombre))
+            warnings.warn(f"Núcleo '{nombre}' ({tipo}) no disponible ({e}); se usa 'numpy'", RuntimeWarning)
+        return _cargar('numpy', tipo)
+
+
+def nucleos_disponibles():
+    """
+    Nombres de los núcleos que se pueden cargar en este entorno.
+    """
+    disponibles = []
+    for nombre in _FABRICAS:
+        try:
+            _cargar(nombre)
+        except ImportError:
+            continue
+        disponibles.append(nombre)
+    return disponibles
@@ -0,0 +1,168 @@
+import numpy as np
+from .alambre import distancia_alambre
+from .campo_streaming import puntos_malla
+from .espira import distancia_espira
+
+# Carga y masa del electrón y del protón
+q_electron, m_electron = -1.602176634e-19, 9.1093837015e-31
+q_proton, m_proton = 1.602176634e-19, 1.67262192369e-27
+
+
+def interpolador_malla(x, y, z, B_malla):
+    """
+    Interpolación trilineal de un campo tabulado en una malla regular.
+
+    Args:
+        x, y, z: Ejes de la malla (arrays 1D crecientes y equiespaciados)
+        B_malla: Campo (nz*ny*nx, 3) en orden x más rápido, como el que
+                 devuelven evaluar_malla_en_disco o cargar_binario
+
+    Returns:
+        funcion_campo: Función r_puntos (n, 3) -> B (n, 3). Fuera de la malla
+                       se usa el valor del borde más cercano.
+    """
+    ejes = [np.asarray(e, dtype=float) for e in (x, y, z)]
+    B = np.asarray(B_malla, dtype=float).reshape(len(z), len(y), len(x), 3)
+
+    def funcion_campo(r_puntos):
+        idx, peso = [], []
+        for d, eje in enumerate(ejes):
+            paso = eje[1] - eje[0]
+            s = np.clip((r_puntos[:, d] - eje[0]) / paso, 0, len(eje) - 1)
+            i = np.minimum(s.astype(int), len(eje) - 2)
+            idx.append(i)
+            peso.append((s - i)[:, None])
+        (ix, iy, iz), (wx, wy, wz) = idx, peso
+
+        # Interpolación sucesiva en x, y, z sobre los 8 vértices de la celda
+        c00 = B[iz, iy, ix] * (1 - wx) + B[iz, iy, ix + 1] * wx
+        c10 = B[iz, iy + 1, ix] * (1 - wx) + B[iz, iy + 1, ix + 1] * wx
+        c01 = B[iz + 1, iy, ix] * (1 - wx) + B[iz + 1, iy, ix + 1] * wx
+        c11 = B[iz + 1, iy + 1, ix] * (1 - wx) + B[iz + 1, iy + 1, ix + 1] * wx
+        c0 = c00 * (1 - wy) + c10 * wy
+        c1 = c01 * (1 - wy) + c11 * wy
+        return c0 * (1 - wz) + c1 * wz
+
+    return funcion_campo
+
+
+def mapa_de_campo(funcion_campo, x, y, z):
+    """
+    Tabula un campo en una malla y devuelve su interpolador.
+
+    Conviene para seguir muchas partículas durante muchos pasos: el campo se
+    integra una sola vez y cada paso cuesta sólo una interpolación.
+
+    Los nodos que caen justo sobre un conductor (campo infinito o NaN) se
+    reemplazan por el promedio de sus vecinos finitos, para que las celdas
+    vecinas sigan dando un campo finito.
+
+    Returns:
+        funcion_campo: Interpolador trilineal r_puntos (n, 3) -> B (n, 3)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        B = funcion_campo(puntos_malla(x, y, z, 0, len(x) * len(y) * len(z)))
+    B = _rellenar_no_finitos(np.asarray(B, dtype=float).reshape(len(z), len(y), len(x), 3))
+    return interpolador_malla(x, y, z, B.reshape(-1, 3))
+
+
+def _rellenar_no_finitos(B):
+    # Promedio de los 6 vecinos finitos de cada nodo no finito (0 si no hay ninguno)
+    malos = ~np.isfinite(B).all(axis=-1)
+    if not malos.any():
+        return B
+    B = np.where(malos[..., None], np.nan, B)
+    borde = np.pad(B, [(1, 1)] * 3 + [(0, 0)], constant_values=np.nan)
+    vecinos = np.stack([np.roll(borde, d, axis=eje)[1:-1, 1:-1, 1:-1]
+                        for eje in range(3) for d in (-1, 1)])
+    suma = np.nansum(vecinos, axis=0)
+    cantidad = np.isfinite(vecinos).all(axis=-1).sum(axis=0)[..., None]
+    B[malos] = (suma / np.maximum(cantidad, 1))[malos]
+    return B
+
+
+def _perdidas(r, limites, geometria, radio_conductor, v=None):
+    # Partículas fuera de la caja, que chocan con un conductor o cuyo estado
+    # dejó de ser finito (campo singular)
+    perdida = ~np.isfinite(r).all(axis=1)
+    if v is not None:
+        perdida |= ~np.isfinite(v).all(axis=1)
+    if limites is not None:
+        for d, (minimo, maximo) in enumerate(limites):
+            perdida |= (r[:, d] < minimo) | (r[:, d] > maximo)
+    if geometria:
+        if geometria['tipo'] in ['alambre', 'ambos']:
+            perdida |= distancia_alambre(r, geometria.get('L', 2), geometria.get('z_offset_alambre', 0)) < radio_conductor
+        if geometria['tipo'] in ['espira', 'ambos']:
+            perdida |= distancia_espira(r, geometria.get('a', 0.5), geometria.get('z_offset_espira', 0)) < radio_conductor
+    return perdida
+
+
+def empujar_particulas(r0, v0, q, m, funcion_campo, dt, n_pasos, limites=None, geometria=None,
+                       radio_conductor=0.01, E=None, cada=1):
+    """
+    Avanza muchas partículas cargadas a la vez con el algoritmo de Boris.
+
+    En cada paso se evalúa el campo una sola vez para todas las partículas
+    vivas. Una partícula se pierde al salir de la caja 'limites', al quedar
+    a menos de radio_conductor de un conductor o si su posición o velocidad
+    dejan de ser finitas; desde ese momento deja de moverse y su trayectoria
+    queda en NaN.
+
+    Args:
+        r0, v0: Posiciones (n, 3) en m y velocidades (n, 3) en m/s iniciales
+        q, m: Carga (C) y masa (kg), escalares o arrays (n,)
+        funcion_campo: Función r_puntos (n, 3) -> B (n, 3), p. ej. campo_escena
+                       o un interpolador de mapa_de_campo
+        dt: Paso de tiempo (s)
+        n_pasos: Cantidad de pasos
+        limites: ((xmin, xmax), (ymin, ymax), (zmin, zmax)) o None
+        geometria: dict con 'tipo' ('alambre', 'espira', 'ambos') y parámetros
+        radio_conductor: Radio de los conductores (m)
+        E: Campo eléctrico uniforme (3,) en V/m, opcional
+        cada: Guardar la posición cada tantos pasos. La posición en que se pierde
+              una partícula se guarda siempre, en la muestra siguiente a su pérdida
+
+    Returns:
+        trayectorias: Array float32 (n_pasos // cada + 1, n, 3)
+        v: Velocidades finales (n, 3)
+        paso_perdida: Paso en que se perdió cada partícula (-1 si sigue viva)
+    """
+    r = np.array(r0, dtype=float)
+    v = np.array(v0, dtype=float)
+    n = len(r)
+    q_m = (np.broadcast_to(q, n) / np.broadcast_to(m, n))[:, None]
+    E = np.zeros(3) if E is None else np.asarray(E, dtype=float)
+
+    trayectorias = np.full((n_pasos // cada + 1, n, 3), np.nan, dtype=np.float32)
+    paso_perdida = np.full(n, -1)
+    vivas = ~_perdidas(r, limites, geometria, radio_conductor, v)
+    paso_perdida[~vivas] = 0
+    trayectorias[0, vivas] = r[vivas]
+
+    for paso in range(1, n_pasos + 1):
+        idx = np.flatnonzero(vivas)
+        if len(idx) == 0:
+            break
+        r_v, v_v, k = r[idx], v[idx], q_m[idx] * dt / 2
+
+        # Boris: medio impulso eléctrico, rotación magnética, medio impulso eléctrico
+        v_menos = v_v + k * E
+        t = k * funcion_campo(r_v)
+        s = 2 * t / (1 + np.sum(t**2, axis=1, keepdims=True))
+        v_prima = v_menos + np.cross(v_menos, t)
+        v_v = v_menos + np.cross(v_prima, s) + k * E
+        r_v = r_v + v_v * dt
+
+        r[idx], v[idx] = r_v, v_v
+        perdida = _perdidas(r_v, limites, geometria, radio_conductor, v_v)
+        vivas[idx[perdida]] = False
+        paso_perdida[idx[perdida]] = paso
+        if paso % cada == 0:
+            # Se incluye la posición de las recién perdidas para ver dónde chocaron
+            trayectorias[paso // cada, idx] = r_v
+        elif perdida.any():
+            # Las que se pierden entre dos muestras guardan el impacto en la siguiente
+            trayectorias[min(paso // cada + 1, len(trayectorias) - 1), idx[perdida]] = r_v[perdida]
+
+    return trayectorias, v, paso_perdida
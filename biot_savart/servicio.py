@@ -0,0 +1,316 @@
+import argparse
+import hashlib
+import http.client
+import json
+import math
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from .campo_streaming import campo_escena
+from .nucleos import obtener_nucleo
+
+# Parámetros aceptados para describir una escena (ver campo_escena)
+PARAMETROS_ESCENA = ('I_alambre', 'L_alambre', 'I_espira', 'a_espira', 'N',
+                     'z_offset_alambre', 'z_offset_espira', 'nucleo')
+VENTANA = 0.002          # Tiempo máximo (s) que se espera para juntar pedidos
+MAX_PUNTOS_LOTE = 200_000
+TAM_CACHE = 256
+
+
+class Agrupador:
+    """
+    Junta pedidos concurrentes y los resuelve con una sola llamada al núcleo.
+
+    El costo de campo_alambre/campo_espira está dominado por el recorrido de
+    los N elementos de corriente, casi independiente de la cantidad de puntos;
+    por eso evaluar muchos pedidos chicos juntos rinde mucho más que uno por uno.
+    """
+
+    def __init__(self, escenas, ventana=VENTANA, max_puntos=MAX_PUNTOS_LOTE):
+        self.escenas = escenas
+        self.ventana = ventana
+        self.max_puntos = max_puntos
+        self.pendientes = queue.Queue()
+        self.llamadas_kernel = 0
+        self.pedidos = 0
+        self.hilo = threading.Thread(target=self._trabajar, daemon=True)
+        self.hilo.start()
+
+    def evaluar(self, id_escena, r_puntos):
+        # Encola el pedido y espera a que el trabajador lo resuelva
+        pedido = {'escena': id_escena, 'r': r_puntos, 'listo': threading.Event()}
+        self.pendientes.put(pedido)
+        pedido['listo'].wait()
+        if 'error' in pedido:
+            raise pedido['error']
+        return pedido['B']
+
+    def _juntar(self):
+        lote = [self.pendientes.get()]
+        n_puntos = len(lote[0]['r'])
+        # La ventana se cuenta desde el primer pedido: un goteo constante no la estira
+        limite = time.monotonic() + self.ventana
+        while n_puntos < self.max_puntos:
+            try:
+                pedido = self.pendientes.get(timeout=max(0, limite - time.monotonic()))
+            except queue.Empty:
+                break
+            lote.append(pedido)
+            n_puntos += len(pedido['r'])
+        return lote
+
+    def _trabajar(self):
+        while True:
+            lote = self._juntar()
+            por_escena = {}
+            for pedido in lote:
+                por_escena.setdefault(pedido['escena'], []).append(pedido)
+
+            for id_escena, pedidos in por_escena.items():
+                try:
+                    r = np.concatenate([p['r'] for p in pedidos])
+                    B = self.escenas[id_escena](r)
+                    self.llamadas_kernel += 1
+                    i0 = 0
+                    for p in pedidos:
+                        p['B'] = B[i0:i0 + len(p['r'])]
+                        i0 += len(p['r'])
+                except Exception as e:
+                    for p in pedidos:
+                        p['error'] = e
+                for p in pedidos:
+                    self.pedidos += 1
+                    p['listo'].set()
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self):
+        # En sockets Unix client_address es una cadena vacía
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, formato, *args):
+        if self.server.verboso:
+            super().log_message(formato, *args)
+
+    def _responder(self, codigo, cuerpo, tipo='application/json'):
+        if not isinstance(cuerpo, bytes):
+            cuerpo = json.dumps(cuerpo).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _leer_cuerpo(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_GET(self):
+        if self.path == '/salud':
+            self._responder(200, {'estado': 'ok'})
+        elif self.path == '/estadisticas':
+            agrupador = self.server.agrupador
+            self._responder(200, {'pedidos': agrupador.pedidos,
+                                  'llamadas_kernel': agrupador.llamadas_kernel,
+                                  'escenas': len(self.server.escenas)})
+        else:
+            self._responder(404, {'error': 'ruta desconocida'})
+
+    def do_POST(self):
+        try:
+            if self.path == '/escenas':
+                parametros = json.loads(self._leer_cuerpo())
+                self._responder(200, {'id': self.server.registrar_escena(parametros)})
+            elif self.path.startswith('/campo/'):
+                id_escena = self.path[len('/campo/'):]
+                datos = self._leer_cuerpo()
+                if id_escena not in self.server.escenas:
+                    self._responder(404, {'error': f'escena desconocida: {id_escena}'})
+                    return
+                if len(datos) % 24:
+                    raise ValueError("El cuerpo debe ser float64 little-endian con forma (n, 3)")
+                B = self.server.evaluar(id_escena, datos)
+                self._responder(200, B, tipo='application/octet-stream')
+            else:
+                self._responder(404, {'error': 'ruta desconocida'})
+        except (ValueError, TypeError) as e:
+            self._responder(400, {'error': str(e)})
+        except Exception as e:
+            # Cualquier otra falla del núcleo: se responde igual, sin cortar la conexión
+            self._responder(500, {'error': f'{type(e).__name__}: {e}'})
+
+
+def _validar_escena(parametros):
+    # Se rechaza al registrar lo que después haría fallar al núcleo
+    if not isinstance(parametros, dict):
+        raise TypeError("La escena debe ser un objeto JSON")
+    desconocidos = set(parametros) - set(PARAMETROS_ESCENA)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+    for nombre, valor in parametros.items():
+        if nombre == 'nucleo':
+            if not isinstance(valor, str):
+                raise TypeError("'nucleo' debe ser una cadena")
+            obtener_nucleo(valor)   # ValueError si no existe
+        elif nombre == 'N':
+            if isinstance(valor, bool) or not isinstance(valor, int) or valor < 2:
+                raise ValueError("'N' debe ser un entero mayor o igual a 2")
+        elif isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+            raise TypeError(f"'{nombre}' debe ser un número finito")
+
+
+class _Servicio:
+    # Estado compartido por los servidores TCP y Unix
+
+    def _iniciar(self, ventana, verboso):
+        self.escenas = {}
+        self.cache = OrderedDict()
+        self.cerrojo_cache = threading.Lock()
+        self.agrupador = Agrupador(self.escenas, ventana)
+        self.verboso = verboso
+
+    def registrar_escena(self, parametros):
+        _validar_escena(parametros)
+        # El id depende sólo de la geometría: registrar dos veces la misma escena es gratis
+        id_escena = hashlib.sha1(json.dumps(parametros, sort_keys=True).encode()).hexdigest()[:16]
+        if id_escena not in self.escenas:
+            self.escenas[id_escena] = campo_escena(**parametros)
+        return id_escena
+
+    def evaluar(self, id_escena, datos):
+        # Caché de resultados recientes: los mismos puntos no se recalculan
+        clave = (id_escena, hashlib.sha1(datos).digest())
+        with self.cerrojo_cache:
+            if clave in self.cache:
+                self.cache.move_to_end(clave)
+                return self.cache[clave]
+        r = np.frombuffer(datos, dtype='<f8').reshape(-1, 3)
+        B = np.ascontiguousarray(self.agrupador.evaluar(id_escena, r), dtype='<f8').tobytes()
+        with self.cerrojo_cache:
+            self.cache[clave] = B
+            if len(self.cache) > TAM_CACHE:
+                self.cache.popitem(last=False)
+        return B
+
+
+class ServidorCampo(_Servicio, ThreadingHTTPServer):
+    """
+    Servicio HTTP local que evalúa el campo de escenas registradas.
+
+    Rutas:
+        POST /escenas        JSON con los parámetros de campo_escena -> {"id": ...}
+        POST /campo/<id>     float64 (n, 3) crudos -> float64 (n, 3) crudos
+        GET  /estadisticas   Pedidos atendidos y llamadas al núcleo
+        GET  /salud          Verificación de funcionamiento
+    """
+    daemon_threads = True
+
+    def __init__(self, direccion=('127.0.0.1', 8765), ventana=VENTANA, verboso=False):
+        self._iniciar(ventana, verboso)
+        super().__init__(direccion, _Manejador)
+
+
+class ServidorCampoUnix(_Servicio, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Igual que ServidorCampo, pero escuchando en un socket Unix.
+    """
+    daemon_threads = True
+
+    def __init__(self, ruta, ventana=VENTANA, verboso=False):
+        self._iniciar(ventana, verboso)
+        # Un socket viejo de una corrida anterior impide volver a escuchar
+        if os.path.exists(ruta) and stat.S_ISSOCK(os.stat(ruta).st_mode):
+            os.remove(ruta)
+        super().__init__(ruta, _Manejador)
+
+
+class _ConexionUnix(http.client.HTTPConnection):
+    def __init__(self, ruta, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.ruta = ruta
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.ruta)
+
+
+class ClienteCampo:
+    """
+    Cliente del servicio de campo. Mantiene una conexión persistente.
+
+    Args:
+        host, puerto: Dirección TCP del servicio
+        socket_unix: Ruta de un socket Unix (tiene prioridad sobre host/puerto)
+    """
+
+    def __init__(self, host='127.0.0.1', puerto=8765, socket_unix=None, timeout=60):
+        if socket_unix:
+            self.conexion = _ConexionUnix(socket_unix, timeout=timeout)
+        else:
+            self.conexion = http.client.HTTPConnection(host, puerto, timeout=timeout)
+
+    def _pedir(self, metodo, ruta, cuerpo=None, tipo='application/json'):
+        self.conexion.request(metodo, ruta, body=cuerpo, headers={'Content-Type': tipo})
+        respuesta = self.conexion.getresponse()
+        datos = respuesta.read()
+        if respuesta.status != 200:
+            raise RuntimeError(f"{respuesta.status}: {json.loads(datos)['error']}")
+        return datos
+
+    def registrar_escena(self, **parametros):
+        return json.loads(self._pedir('POST', '/escenas', json.dumps(parametros)))['id']
+
+    def campo(self, id_escena, r_puntos):
+        """
+        Evalúa el campo de una escena registrada en los puntos dados.
+
+        Returns:
+            B: Array (n, 3)
+        """
+        cuerpo = np.ascontiguousarray(r_puntos, dtype='<f8').tobytes()
+        datos = self._pedir('POST', f'/campo/{id_escena}', cuerpo, 'application/octet-stream')
+        return np.frombuffer(datos, dtype='<f8').reshape(-1, 3)
+
+    def estadisticas(self):
+        return json.loads(self._pedir('GET', '/estadisticas'))
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de evaluación del campo magnético")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--socket', help="Escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument('--ventana', type=float, default=VENTANA * 1000,
+                        help="Espera máxima para agrupar pedidos, en ms")
+    parser.add_argument('--verboso', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.socket:
+        servidor = ServidorCampoUnix(args.socket, args.ventana / 1000, args.verboso)
+        print(f"Escuchando en {args.socket}")
+    else:
+        servidor = ServidorCampo((args.host, args.puerto), args.ventana / 1000, args.verboso)
+        print(f"Escuchando en http://{args.host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,485 @@
+import numpy as np
+import plotly.graph_objects as go
+from .alambre import distancia_alambre
+from .espira import distancia_espira
+
+def _agregar_geometria_2d(fig, geometria):
+    # Fuentes vistas en el plano XY
+    if geometria:
+        if geometria['tipo'] in ['alambre', 'ambos']:
+            L = geometria.get('L', 2)
+            z_offset = geometria.get('z_offset_alambre', 0)
+            # En vista 2D (XY), el alambre se ve como un punto en (0,0)
+            fig.add_trace(go.Scatter(
+                x=[0],
+                y=[0],
+                mode='markers',
+                marker=dict(size=12, color='red', symbol='circle', line=dict(width=2, color='white')),
+                name='Alambre',
+                hovertemplate=f'Alambre (eje Z)<br>L={L} m<br>z_offset={z_offset} m<extra></extra>'
+            ))
+        
+        if geometria['tipo'] in ['espira', 'ambos']:
+            a = geometria.get('a', 0.5)
+            z_offset = geometria.get('z_offset_espira', 0)
+            theta = np.linspace(0, 2*np.pi, 100)
+            fig.add_trace(go.Scatter(
+                x=a*np.cos(theta),
+                y=a*np.sin(theta),
+                mode='lines',
+                line=dict(color='cyan', width=3),
+                name='Espira',
+                hovertemplate=f'Espira<br>Radio={a} m<br>z_offset={z_offset} m<extra></extra>'
+            ))
+
+
+def crear_grafico_2d_plotly(xx, yy, Bx, By, titulo="Campo Magnético 2D", geometria=None):
+    """
+    Crea un gráfico 2D interactivo del campo magnético usando Plotly.
+    
+    Args:
+        xx, yy: Mallas de coordenadas
+        Bx, By: Componentes del campo magnético
+        titulo: Título del gráfico
+        geometria: dict con información de la geometría
+    
+    Returns:
+        fig: Figura de Plotly
+    """
+    # Calcular magnitud del campo
+    B_mag = np.sqrt(Bx**2 + By**2)
+    
+    # Crear figura
+    fig = go.Figure()
+    
+    # Añadir heatmap de magnitud
+    fig.add_trace(go.Heatmap(
+        x=xx[0, :],
+        y=yy[:, 0],
+        z=B_mag,
+        colorscale='Viridis',
+        colorbar=dict(title='|B| (T)'),
+        name='Magnitud',
+        hovertemplate='x: %{x:.3f}<br>y: %{y:.3f}<br>|B|: %{z:.3e} T<extra></extra>'
+    ))
+    
+    # Añadir vectores del campo (subsample para no saturar)
+    step = max(1, len(xx) // 15)
+    xx_sub = xx[::step, ::step]
+    yy_sub = yy[::step, ::step]
+    Bx_sub = Bx[::step, ::step]
+    By_sub = By[::step, ::step]
+    B_mag_sub = B_mag[::step, ::step]
+    
+    # Normalizar para visualización
+    B_max = np.max(B_mag)
+    if B_max > 0:
+        scale = 0.08 * (xx.max() - xx.min())
+        Bx_scaled = Bx_sub / B_max * scale
+        By_scaled = By_sub / B_max * scale
+    else:
+        Bx_scaled = Bx_sub
+        By_scaled = By_sub
+    
+    # Añadir quiver (vectores)
+    for i in range(xx_sub.shape[0]):
+        for j in range(xx_sub.shape[1]):
+            x0, y0 = xx_sub[i, j], yy_sub[i, j]
+            dx, dy = Bx_scaled[i, j], By_scaled[i, j]
+            
+            fig.add_trace(go.Scatter(
+                x=[x0, x0 + dx],
+                y=[y0, y0 + dy],
+                mode='lines',
+                line=dict(color='white', width=1.5),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            
+            # Flecha
+            fig.add_trace(go.Scatter(
+                x=[x0 + dx],
+                y=[y0 + dy],
+                mode='markers',
+                marker=dict(
+                    symbol='arrow',
+                    size=8,
+                    color='white',
+                    angle=np.degrees(np.arctan2(dy, dx)),
+                    angleref='previous'
+                ),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+    
+    # Dibujar geometría
+    _agregar_geometria_2d(fig, geometria)
+    
+    # Configurar layout
+    fig.update_layout(
+        title=titulo,
+        xaxis=dict(title='x (m)', scaleanchor='y', scaleratio=1),
+        yaxis=dict(title='y (m)'),
+        width=700,
+        height=700,
+        showlegend=True,
+        hovermode='closest'
+    )
+    
+    return fig
+
+
+def _agregar_geometria_3d(fig, geometria):
+    # Fuentes en el espacio
+    if geometria:
+        if geometria['tipo'] in ['alambre', 'ambos']:
+            L = geometria.get('L', 2)
+            z_offset = geometria.get('z_offset_alambre', 0)
+            zs = np.linspace(-L/2 + z_offset, L/2 + z_offset, 50)
+            fig.add_trace(go.Scatter3d(
+                x=np.zeros_like(zs),
+                y=np.zeros_like(zs),
+                z=zs,
+                mode='lines',
+                line=dict(color='red', width=6),
+                name='Alambre',
+                hovertemplate=f'Alambre<br>L={L} m<extra></extra>'
+            ))
+        
+        if geometria['tipo'] in ['espira', 'ambos']:
+            a = geometria.get('a', 0.5)
+            z_offset = geometria.get('z_offset_espira', 0)
+            theta = np.linspace(0, 2*np.pi, 100)
+            fig.add_trace(go.Scatter3d(
+                x=a*np.cos(theta),
+                y=a*np.sin(theta),
+                z=np.full_like(theta, z_offset),
+                mode='lines',
+                line=dict(color='cyan', width=6),
+                name='Espira',
+                hovertemplate=f'Espira<br>Radio={a} m<extra></extra>'
+            ))
+
+
+def importancia_conos(x, y, z, Bx, By, Bz, geometria=None, vecinos=6):
+    """
+    Calcula la importancia visual de cada punto para el gráfico de conos.
+
+    Combina tres criterios normalizados a [0, 1]: magnitud del campo (en escala
+    logarítmica, porque |B| diverge cerca de los conductores), cambio de
+    dirección respecto de los puntos vecinos y cercanía a las fuentes.
+
+    Args:
+        x, y, z: Coordenadas de los puntos (arrays 1D)
+        Bx, By, Bz: Componentes del campo magnético
+        geometria: dict con información de la geometría (opcional)
+        vecinos: Cantidad de vecinos usados para medir el cambio de dirección
+
+    Returns:
+        importancia: Array 1D con un valor en [0, 1] por punto
+    """
+    from scipy.spatial import cKDTree
+    
+    r = np.c_[x, y, z]
+    B = np.c_[Bx, By, Bz]
+    B_mag = np.linalg.norm(B, axis=1)
+
+    # Magnitud
+    log_B = np.log10(np.maximum(B_mag, np.finfo(float).tiny))
+    rango = np.ptp(log_B)
+    magnitud = (log_B - log_B.min()) / rango if rango > 0 else np.zeros_like(log_B)
+
+    # Cambio de dirección: 1 - coseno medio con los vecinos más cercanos
+    u = B / np.where(B_mag > 0, B_mag, 1)[:, None]
+    k = min(vecinos + 1, len(r))
+    _, idx = cKDTree(r).query(r, k=k)
+    idx = np.asarray(idx).reshape(len(r), -1)
+    cos_medio = np.einsum('ij,ikj->ik', u, u[idx[:, 1:]]).mean(axis=1) if k > 1 else np.ones(len(r))
+    cambio = (1 - cos_medio) / 2
+
+    # Cercanía a las fuentes
+    criterios = [magnitud, cambio]
+    if geometria:
+        d = np.full(len(r), np.inf)
+        if geometria['tipo'] in ['alambre', 'ambos']:
+            d = np.minimum(d, distancia_alambre(r, geometria.get('L', 2), geometria.get('z_offset_alambre', 0)))
+        if geometria['tipo'] in ['espira', 'ambos']:
+            d = np.minimum(d, distancia_espira(r, geometria.get('a', 0.5), geometria.get('z_offset_espira', 0)))
+        escala = 0.25 * np.max(np.ptp(r, axis=0))
+        criterios.append(np.exp(-d / escala) if escala > 0 else np.ones(len(r)))
+
+    return np.mean(criterios, axis=0)
+
+
+def seleccionar_conos(x, y, z, Bx, By, Bz, max_conos, geometria=None, semilla=0):
+    """
+    Elige a lo sumo max_conos puntos para el gráfico de conos según su importancia.
+
+    El muestreo es ponderado y sin reemplazo: los puntos importantes tienen más
+    probabilidad de quedar, pero todas las regiones conservan algo de cobertura.
+    Con la misma semilla la selección es siempre la misma.
+
+    Returns:
+        idx: Índices (ordenados) de los puntos elegidos
+    """
+    n = len(x)
+    if n <= max_conos:
+        return np.arange(n)
+    peso = 0.05 + importancia_conos(x, y, z, Bx, By, Bz, geometria)
+    # Claves de Efraimidis-Spirakis: u^(1/w); se quedan las max_conos mayores
+    claves = np.random.default_rng(semilla).random(n) ** (1 / peso)
+    return np.sort(np.argpartition(claves, n - max_conos)[n - max_conos:])
+
+
+def _reducir_volumen(x, y, z, valor, max_por_eje):
+    """
+    Submuestrea un escalar dado sobre una malla regular (en cualquier orden).
+
+    Se toman índices equiespaciados de cada eje, incluidos los extremos, de
+    modo que el volumen enviado tiene a lo sumo max_por_eje^3 puntos.
+
+    Returns:
+        x, y, z, valor: Arrays 1D del volumen reducido; si los puntos no
+                        forman una malla regular se devuelven sin cambios
+    """
+    ejes = [np.unique(c) for c in (x, y, z)]
+    if np.prod([len(e) for e in ejes]) != len(valor):
+        return x, y, z, valor
+    idx = tuple(np.searchsorted(e, c) for e, c in zip(ejes, (x, y, z)))
+    volumen = np.empty([len(e) for e in ejes], dtype=np.asarray(valor).dtype)
+    volumen[idx] = valor
+
+    paso = [np.unique(np.linspace(0, len(e) - 1, min(len(e), max_por_eje)).round().astype(int)) for e in ejes]
+    volumen = volumen[np.ix_(*paso)]
+    xs, ys, zs = np.meshgrid(*(e[p] for e, p in zip(ejes, paso)), indexing='ij')
+    return xs.ravel(), ys.ravel(), zs.ravel(), volumen.ravel()
+
+
+def tamano_payload(fig):
+    """
+    Devuelve el tamaño en bytes de la figura serializada que recibe el navegador.
+    """
+    return len(fig.to_json().encode('utf-8'))
+
+
+def crear_grafico_3d_plotly(x, y, z, Bx, By, Bz, titulo="Campo Magnético 3D", geometria=None,
+                            max_conos=None, escalar=None, max_escalar=12):
+    """
+    Crea un gráfico 3D interactivo del campo magnético usando Plotly.
+    
+    Args:
+        x, y, z: Coordenadas de los puntos (arrays 1D)
+        Bx, By, Bz: Componentes del campo magnético
+        titulo: Título del gráfico
+        geometria: dict con información de la geometría
+        max_conos: Cantidad máxima de conos a dibujar (None = todos)
+        escalar: None, 'isosuperficies' o 'cortes' para agregar una vista de |B|
+        max_escalar: Puntos por eje del volumen de |B| que se envía (la malla
+                     se submuestrea si es más fina)
+    
+    Returns:
+        fig: Figura de Plotly
+    """
+    # Calcular magnitud
+    B_mag = np.sqrt(Bx**2 + By**2 + Bz**2)
+    B_max = np.max(B_mag)
+    
+    # Crear figura
+    fig = go.Figure()
+    
+    # Vista escalar de |B| (log10, ya que diverge en las fuentes) sobre una
+    # versión reducida de la malla, para no enviar el volumen entero
+    if escalar:
+        log_B = np.log10(np.maximum(B_mag, np.finfo(float).tiny)).astype(np.float32)
+        iso_min, iso_max = np.percentile(log_B, [5, 99])
+        xs, ys, zs, log_B = _reducir_volumen(x, y, z, log_B, max_escalar)
+        if escalar == 'isosuperficies':
+            extra = dict(surface_count=4, opacity=0.25)
+        else:
+            # Tres cortes ortogonales por el centro del dominio
+            extra = dict(surface=dict(show=False),
+                         slices=dict(x=dict(show=True, locations=[float(np.median(xs))]),
+                                     y=dict(show=True, locations=[float(np.median(ys))]),
+                                     z=dict(show=True, locations=[float(np.median(zs))])))
+        fig.add_trace(go.Isosurface(
+            x=np.asarray(xs, dtype=np.float32), y=np.asarray(ys, dtype=np.float32),
+            z=np.asarray(zs, dtype=np.float32), value=log_B,
+            isomin=iso_min, isomax=iso_max,
+            colorscale='Viridis', showscale=False,
+            caps=dict(x_show=False, y_show=False, z_show=False),
+            name='log10 |B|',
+            hovertemplate='log10|B|: %{value:.2f}<extra></extra>',
+            **extra
+        ))
+    
+    # Nivel de detalle: sólo se envían los conos más importantes
+    if max_conos is not None and len(x) > max_conos:
+        idx = seleccionar_conos(x, y, z, Bx, By, Bz, max_conos, geometria)
+        x, y, z, Bx, By, Bz = (np.asarray(c)[idx] for c in (x, y, z, Bx, By, Bz))
+    
+    # Normalizar vectores para visualización
+    if B_max > 0:
+        scale = 0.15
+        Bx_norm = Bx / B_max * scale
+        By_norm = By / B_max * scale
+        Bz_norm = Bz / B_max * scale
+    else:
+        Bx_norm = Bx
+        By_norm = By
+        Bz_norm = Bz
+    
+    # Añadir vectores usando Cone plot
+    fig.add_trace(go.Cone(
+        x=x, y=y, z=z,
+        u=Bx_norm, v=By_norm, w=Bz_norm,
+        colorscale='Viridis',
+        sizemode='absolute',
+        sizeref=0.3,
+        colorbar=dict(title='|B| (T)'),
+        cmin=0,
+        cmax=B_max,
+        hovertemplate='x: %{x:.2f}<br>y: %{y:.2f}<br>z: %{z:.2f}<br>|B|: %{marker.color:.3e} T<extra></extra>',
+        showscale=True
+    ))
+    
+    # Dibujar geometría
+    _agregar_geometria_3d(fig, geometria)
+    
+    # Configurar layout
+    fig.update_layout(
+        title=titulo,
+        scene=dict(
+            xaxis=dict(title='x (m)'),
+            yaxis=dict(title='y (m)'),
+            zaxis=dict(title='z (m)'),
+            aspectmode='cube'
+        ),
+        width=700,
+        height=700,
+        showlegend=True
+    )
+    
+    return fig
+
+
+def crear_animacion_2d_plotly(xx, yy, cuadros_Bx, cuadros_By, tiempos, titulo="Campo Magnético 2D",
+                              geometria=None, flechas=15):
+    """
+    Crea una animación 2D del campo magnético variable en el tiempo.
+
+    Cada cuadro contiene sólo un heatmap de |B| y una única traza con todas
+    las flechas, de modo que cambiar de cuadro es barato en el navegador.
+
+    Args:
+        xx, yy: Mallas de coordenadas
+        cuadros_Bx, cuadros_By: Componentes del campo por cuadro (T, ny, nx),
+            p. ej. de animacion.construir_cuadros
+        tiempos: Instante de cada cuadro (T,), en s
+        titulo: Título del gráfico
+        geometria: dict con información de la geometría
+        flechas: Cantidad aproximada de flechas por eje
+
+    Returns:
+        fig: Figura de Plotly con cuadros de animación
+    """
+    B_mag = np.sqrt(cuadros_Bx**2 + cuadros_By**2)
+    B_max = np.max(B_mag)
+    
+    step = max(1, len(xx) // flechas)
+    x0 = xx[::step, ::step].ravel()
+    y0 = yy[::step, ::step].ravel()
+    escala = 0.08 * (xx.max() - xx.min()) / B_max if B_max > 0 else 0
+    
+    def trazas(i):
+        # Segmentos de todas las flechas en una sola traza, separados por NaN
+        dx = cuadros_Bx[i][::step, ::step].ravel() * escala
+        dy = cuadros_By[i][::step, ::step].ravel() * escala
+        nada = np.full_like(x0, np.nan)
+        return [
+            go.Heatmap(x=xx[0, :], y=yy[:, 0], z=B_mag[i], zmin=0, zmax=B_max,
+                       colorscale='Viridis', colorbar=dict(title='|B| (T)'), name='Magnitud'),
+            go.Scatter(x=np.c_[x0, x0 + dx, nada].ravel(), y=np.c_[y0, y0 + dy, nada].ravel(),
+                       mode='lines', line=dict(color='white', width=1.5),
+                       showlegend=False, hoverinfo='skip'),
+        ]
+    
+    fig = go.Figure(data=trazas(0))
+    _agregar_geometria_2d(fig, geometria)
+    fig.frames = [go.Frame(data=trazas(i), traces=[0, 1], name=f"{t:.4g}")
+                  for i, t in enumerate(tiempos)]
+    
+    fig.update_layout(
+        title=titulo,
+        xaxis=dict(title='x (m)', scaleanchor='y', scaleratio=1),
+        yaxis=dict(title='y (m)'),
+        width=700,
+        height=750,
+        showlegend=True,
+        hovermode='closest',
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            y=-0.08,
+            buttons=[
+                dict(label='▶', method='animate',
+                     args=[None, dict(frame=dict(duration=50, redraw=True), fromcurrent=True)]),
+                dict(label='⏸', method='animate',
+                     args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')]),
+            ]
+        )],
+        sliders=[dict(
+            currentvalue=dict(prefix='t = ', suffix=' s'),
+            steps=[dict(label=f.name, method='animate',
+                        args=[[f.name], dict(frame=dict(duration=0, redraw=True), mode='immediate')])
+                   for f in fig.frames]
+        )]
+    )
+    
+    return fig
+
+
+def crear_grafico_trayectorias_plotly(trayectorias, titulo="Trayectorias de Partículas", geometria=None):
+    """
+    Dibuja las trayectorias de muchas partículas en una sola traza 3D.
+
+    Las partículas se separan con NaN en lugar de usar una traza por
+    partícula, lo que mantiene liviano el gráfico aun con miles de ellas.
+
+    Args:
+        trayectorias: Array (n_t, n, 3) de empujar_particulas (NaN = perdida)
+        titulo: Título del gráfico
+        geometria: dict con información de la geometría
+
+    Returns:
+        fig: Figura de Plotly
+    """
+    n_t, n, _ = trayectorias.shape
+    separador = np.full((n, 1, 3), np.nan, dtype=trayectorias.dtype)
+    puntos = np.concatenate([trayectorias.transpose(1, 0, 2), separador], axis=1).reshape(-1, 3)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter3d(
+        x=puntos[:, 0], y=puntos[:, 1], z=puntos[:, 2],
+        mode='lines',
+        line=dict(color='orange', width=2),
+        connectgaps=False,
+        name=f'Partículas ({n})',
+        hoverinfo='skip'
+    ))
+    
+    _agregar_geometria_3d(fig, geometria)
+    
+    fig.update_layout(
+        title=titulo,
+        scene=dict(
+            xaxis=dict(title='x (m)'),
+            yaxis=dict(title='y (m)'),
+            zaxis=dict(title='z (m)'),
+            aspectmode='cube'
+        ),
+        width=700,
+        height=700,
+        showlegend=True
+    )
+    
+    return fig
@@ -1,7 +1,29 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import numpy as np
 import unittest
-from alambre import campo_alambre, mu0
-from espira import campo_espira
+import warnings
+from importlib.util import find_spec
+from biot_savart.alambre import campo_alambre, mu0, potencial_alambre
+from biot_savart.espira import campo_espira, potencial_espira
+from biot_savart.campo_streaming import (campo_escena, evaluar_bloques_en_disco, evaluar_malla_en_disco, potencial_escena,
+                                         puntos_malla)
+from biot_savart.exportacion import cargar_binario, exportar_a_bytes, exportar_campo
+from biot_savart.animacion import campos_unitarios, construir_cuadros, corrientes_armonicas, exportar_cuadros
+from biot_savart.servicio import Agrupador, ClienteCampo, ServidorCampo
+from biot_savart.integrales import (borde_rectangulo, camino_circulo, flujo, flujo_malla, flujo_por_potencial,
+                                    integral_linea, superficie_disco, superficie_rectangulo)
+from biot_savart.particulas import (empujar_particulas, interpolador_malla, m_electron, m_proton, mapa_de_campo,
+                                    q_electron, q_proton)
+from biot_savart.nucleos import _FABRICAS, obtener_nucleo, registrar_nucleo
+from biot_savart.convergencia import (campo_alambre_richardson, campo_espira_richardson, error_cuadratura,
+                                     extrapolar_richardson)
+from biot_savart.visualizacion_plotly import (crear_animacion_2d_plotly, crear_grafico_3d_plotly, seleccionar_conos,
+                                              tamano_payload)
 
 class TestBiotSavart(unittest.TestCase):
 
@@ -54,5 +76,488 @@ class TestBiotSavart(unittest.TestCase):
         self.assertTrue(np.isclose(B_calc[0, 1], 0))
         self.assertTrue(B_calc[0, 2] > 0)
 
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.dir.name, 'campo.npy')
+        self.x = np.linspace(-1, 1, 5)
+        self.y = np.linspace(-1, 1, 4)
+        self.z = np.linspace(-1, 1, 3)
+        self.campo = campo_escena(I_alambre=10.0, I_espira=5.0, N=200)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_coincide_con_calculo_directo(self):
+        B = evaluar_malla_en_disco(self.campo, self.x, self.y, self.z, self.ruta, tam_bloque=7)
+        r = puntos_malla(self.x, self.y, self.z, 0, 60)
+        self.assertTrue(np.allclose(B, self.campo(r)))
+
+    def test_reanudar_tras_interrupcion(self):
+        llamadas = []
+
+        def campo_que_falla(r):
+            llamadas.append(len(r))
+            if len(llamadas) == 3:
+                raise KeyboardInterrupt
+            return self.campo(r)
+
+        with self.assertRaises(KeyboardInterrupt):
+            evaluar_malla_en_disco(campo_que_falla, self.x, self.y, self.z, self.ruta, tam_bloque=10)
+
+        # Al reanudar sólo se calculan los 4 bloques que faltaban
+        llamadas.clear()
+        B = evaluar_malla_en_disco(lambda r: llamadas.append(len(r)) or self.campo(r),
+                                   self.x, self.y, self.z, self.ruta, tam_bloque=10)
+        self.assertEqual(sum(llamadas), 40)
+        r = puntos_malla(self.x, self.y, self.z, 0, 60)
+        self.assertTrue(np.allclose(B, self.campo(r)))
+
+        # Empezar más adelante de lo ya calculado dejaría un hueco
+        with self.assertRaises(ValueError):
+            evaluar_bloques_en_disco(self.campo, [puntos_malla(self.x, self.y, self.z, 30, 60)], 60,
+                                     os.path.join(self.dir.name, 'otro.npy'), inicio=30)
+
+    def test_exportar_npz_y_binario(self):
+        B = evaluar_malla_en_disco(self.campo, self.x, self.y, self.z, self.ruta, tam_bloque=7)
+
+        exportar_campo(os.path.join(self.dir.name, 'campo.npz'), self.x, self.y, self.z, B)
+        datos = np.load(os.path.join(self.dir.name, 'campo.npz'))
+        self.assertEqual(datos['B'].shape, (3, 4, 5, 3))
+        self.assertTrue(np.allclose(datos['B'].reshape(-1, 3), B))
+
+        ruta_bin = os.path.join(self.dir.name, 'campo.bin')
+        exportar_campo(ruta_bin, self.x, self.y, self.z, B)
+        x, y, z, B_bin = cargar_binario(ruta_bin)
+        self.assertIsInstance(B_bin, np.memmap)
+        self.assertTrue(np.allclose(B_bin.reshape(-1, 3), B))
+        self.assertTrue(np.allclose(z, self.z))
+
+    def test_exportar_vti(self):
+        B = self.campo(puntos_malla(self.x, self.y, self.z, 0, 60))
+        datos = exportar_a_bytes(self.x, self.y, self.z, B, 'vti')
+        self.assertIn(b'<ImageData WholeExtent="0 4 0 3 0 2"', datos)
+        # El primer arreglo de la sección appended es B, precedido por su tamaño
+        inicio = datos.index(b'_', datos.index(b'<AppendedData')) + 1
+        n_bytes = int(np.frombuffer(datos[inicio:inicio + 8], dtype='<u8')[0])
+        self.assertEqual(n_bytes, 60 * 3 * 8)
+        B_vti = np.frombuffer(datos[inicio + 8:inicio + 8 + n_bytes], dtype='<f8')
+        self.assertTrue(np.allclose(B_vti.reshape(-1, 3), B))
+        with self.assertRaises(ValueError):
+            exportar_a_bytes(self.x, self.y, np.array([0.0, 0.1, 0.5]), B, 'vti')
+
+    def test_no_reanuda_otro_calculo(self):
+        escena = dict(I_alambre=10.0, I_espira=5.0, N=200)
+        evaluar_malla_en_disco(self.campo, self.x, self.y, self.z, self.ruta, tam_bloque=7, clave=escena)
+
+        # Otros ejes con la misma cantidad de puntos
+        llamadas = []
+        B = evaluar_malla_en_disco(lambda r: llamadas.append(len(r)) or self.campo(r),
+                                   2 * self.x, self.y, self.z, self.ruta, tam_bloque=7, clave=escena)
+        self.assertEqual(sum(llamadas), 60)
+        self.assertTrue(np.allclose(B, self.campo(puntos_malla(2 * self.x, self.y, self.z, 0, 60))))
+
+        # Otra corriente sobre los mismos ejes
+        otra = dict(escena, I_alambre=3.0)
+        campo_otro = campo_escena(**otra)
+        llamadas.clear()
+        B = evaluar_malla_en_disco(lambda r: llamadas.append(len(r)) or campo_otro(r),
+                                   2 * self.x, self.y, self.z, self.ruta, tam_bloque=7, clave=otra)
+        self.assertEqual(sum(llamadas), 60)
+        self.assertTrue(np.allclose(B, campo_otro(puntos_malla(2 * self.x, self.y, self.z, 0, 60))))
+
+        # Mismo cálculo otra vez: no se recalcula nada
+        llamadas.clear()
+        evaluar_malla_en_disco(lambda r: llamadas.append(len(r)) or campo_otro(r),
+                               2 * self.x, self.y, self.z, self.ruta, tam_bloque=7, clave=otra)
+        self.assertEqual(llamadas, [])
+
+class TestRichardson(unittest.TestCase):
+
+    def test_espira_eje(self):
+        I, a, z = 5.0, 0.5, 0.5
+        B_teorico = (mu0 * I * a**2) / (2 * (a**2 + z**2)**(1.5))
+
+        # Con sólo 50 y 99 elementos supera ampliamente a N = 1000 sin extrapolar
+        B, error = campo_espira_richardson(I, a, 50, np.array([[0, 0, z]]))
+        B_directo = campo_espira(I, a, 1000, np.array([[0, 0, z]]))
+        self.assertLess(abs(B[0, 2] - B_teorico), 1e-3 * abs(B_directo[0, 2] - B_teorico))
+        self.assertGreater(error[0], abs(B[0, 2] - B_teorico))
+
+    def test_alambre_finito(self):
+        # Alambre finito: B = mu0 I / (4 pi r) * 2 (L/2) / sqrt((L/2)^2 + r^2)
+        I, L, r = 10.0, 2.0, 0.3
+        B_teorico = mu0 * I / (4 * np.pi * r) * L / np.sqrt((L / 2)**2 + r**2)
+        r_puntos = np.array([[r, 0, 0]])
+
+        B_directo = campo_alambre(I, L, 400, r_puntos)
+        B, error = campo_alambre_richardson(I, L, 200, r_puntos, niveles=3)
+        error_real = abs(B[0, 1] - B_teorico)
+        self.assertLess(error_real, abs(B_directo[0, 1] - B_teorico))
+        self.assertLess(error_real, error[0])
+
+    def test_error_cuadratura_reusa_campo_calculado(self):
+        r_puntos = np.array([[0.3, 0, 0], [0.1, 0.2, 0.4]])
+        llamadas = []
+
+        def campo_N(n):
+            llamadas.append(n)
+            return campo_alambre(10.0, 2.0, n, r_puntos)
+
+        B, error = error_cuadratura(campo_N, 400)
+        B_N = campo_alambre(10.0, 2.0, 400, r_puntos)
+        llamadas.clear()
+        B_reuso, error_reuso = error_cuadratura(campo_N, 400, B_N)
+        self.assertEqual(llamadas, [200])
+        self.assertTrue(np.allclose(B_reuso, B))
+        self.assertTrue(np.allclose(error_reuso, error))
+
+    def test_resoluciones_invalidas(self):
+        campo_N = lambda n: campo_alambre(10.0, 2.0, n, np.array([[0.3, 0, 0]]))
+        for Ns in ([1, 3], [5, 5], [9, 5]):
+            with self.assertRaises(ValueError):
+                extrapolar_richardson(campo_N, Ns)
+        # N = 2 pediría una resolución de 1 elemento
+        with self.assertRaises(ValueError):
+            error_cuadratura(campo_N, 2)
+
+class TestAnimacion(unittest.TestCase):
+
+    def test_cuadros_coinciden_con_calculo_directo(self):
+        r = np.array([[0.3, 0.0, 0.2], [0.0, 0.0, 0.5], [1.0, -0.5, 0.0]])
+        B_unitarios = campos_unitarios(r, 2.0, 0.5, 500)
+        tiempos = np.linspace(0, 0.02, 9)
+        corrientes = corrientes_armonicas(tiempos, [10.0, 5.0], 50.0, [0.0, np.pi / 2])
+        cuadros = construir_cuadros(B_unitarios, corrientes)
+
+        self.assertEqual(cuadros.shape, (9, 3, 3))
+        i = 3
+        B_directo = (campo_alambre(corrientes[i, 0], 2.0, 500, r)
+                     + campo_espira(corrientes[i, 1], 0.5, 500, r))
+        self.assertTrue(np.allclose(cuadros[i], B_directo))
+
+        with tempfile.TemporaryDirectory() as d:
+            pila = exportar_cuadros(os.path.join(d, 'cuadros.npy'), B_unitarios, corrientes)
+            self.assertTrue(np.allclose(pila, cuadros))
+            del pila
+
+    def test_animacion_plotly(self):
+        eje = np.linspace(-1.5, 1.5, 12)
+        xx, yy = np.meshgrid(eje, eje)
+        r = np.c_[xx.ravel(), yy.ravel(), np.zeros(xx.size)]
+        tiempos = np.linspace(0, 0.02, 5)
+        corrientes = corrientes_armonicas(tiempos, [10.0, 5.0], 50.0, [0.0, np.pi / 2])
+        cuadros = construir_cuadros(campos_unitarios(r, 2.0, 0.5, 200), corrientes).reshape(5, 12, 12, 3)
+
+        fig = crear_animacion_2d_plotly(xx, yy, cuadros[..., 0], cuadros[..., 1], tiempos,
+                                        geometria={'tipo': 'ambos', 'L': 2.0, 'a': 0.5}, flechas=6)
+        self.assertEqual(len(fig.frames), len(tiempos))
+        for cuadro in fig.frames:
+            # Sólo se reemplazan el heatmap y la traza de flechas; la geometría queda fija
+            self.assertEqual(tuple(cuadro.traces), (0, 1))
+            self.assertEqual([d.type for d in cuadro.data], ['heatmap', 'scatter'])
+            # Una sola traza con las 6 x 6 flechas: inicio, fin y NaN por flecha
+            flechas = cuadro.data[1]
+            self.assertEqual(len(flechas.x), 3 * 36)
+            self.assertEqual(np.isnan(np.asarray(flechas.x, dtype=float)).sum(), 36)
+
+class TestServicio(unittest.TestCase):
+
+    def _iniciar(self, ventana):
+        servidor = ServidorCampo(('127.0.0.1', 0), ventana=ventana)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        self.addCleanup(servidor.server_close)
+        self.addCleanup(servidor.shutdown)
+        return servidor, servidor.server_address[1]
+
+    def test_pedidos_concurrentes_se_agrupan(self):
+        servidor, puerto = self._iniciar(ventana=0.05)
+        escena = dict(I_alambre=10.0, L_alambre=2.0, I_espira=5.0, a_espira=0.5, N=100)
+        id_escena = ClienteCampo('127.0.0.1', puerto).registrar_escena(**escena)
+        lotes = np.random.default_rng(0).uniform(-1, 1, size=(8, 5, 3))
+        resultados = [None] * len(lotes)
+
+        def pedir(i):
+            resultados[i] = ClienteCampo('127.0.0.1', puerto).campo(id_escena, lotes[i])
+
+        hilos = [threading.Thread(target=pedir, args=(i,)) for i in range(len(lotes))]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+
+        campo = campo_escena(**escena)
+        for r, B in zip(lotes, resultados):
+            self.assertTrue(np.allclose(B, campo(r)))
+        self.assertLess(servidor.agrupador.llamadas_kernel, len(lotes))
+
+    def test_errores_responden_json(self):
+        servidor, puerto = self._iniciar(ventana=0.001)
+        cliente = ClienteCampo('127.0.0.1', puerto)
+        for escena in (dict(N=1), dict(I_alambre='x'), dict(nucleo='inexistente'), dict(L_alambre=float('inf'))):
+            with self.assertRaisesRegex(RuntimeError, '^400'):
+                cliente.registrar_escena(**escena)
+
+        # Una falla inesperada del núcleo da 500 y la conexión sigue sirviendo
+        def falla(r):
+            raise IndexError("falla del núcleo")
+        servidor.escenas['rota'] = falla
+        with self.assertRaisesRegex(RuntimeError, '^500: IndexError'):
+            cliente.campo('rota', np.zeros((2, 3)))
+        self.assertEqual(cliente.estadisticas()['pedidos'], 1)
+
+    def test_ventana_acota_la_espera_con_goteo(self):
+        ventana = 0.05
+        agrupador = Agrupador({'e': lambda r: r}, ventana=ventana)
+        parar = threading.Event()
+
+        def goteo():
+            # Pedidos de un punto cada 5 ms, más seguidos que la ventana
+            while not parar.is_set():
+                threading.Thread(target=agrupador.evaluar, args=('e', np.zeros((1, 3))), daemon=True).start()
+                time.sleep(0.005)
+
+        t0 = time.perf_counter()
+        hilo = threading.Thread(target=goteo)
+        hilo.start()
+        try:
+            agrupador.evaluar('e', np.ones((1, 3)))
+            espera = time.perf_counter() - t0
+        finally:
+            parar.set()
+            hilo.join()
+        self.assertLess(espera, ventana + 0.05)
+
+class TestImportacion(unittest.TestCase):
+
+    # Tiempo máximo (s) para importar el paquete, NumPy incluido
+    PRESUPUESTO = 0.5
+
+    def _ejecutar(self, codigo):
+        salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return salida.stdout
+
+    def test_presupuesto_de_importacion(self):
+        salida = self._ejecutar(
+            "import sys, time\n"
+            "t = time.perf_counter()\n"
+            "import biot_savart\n"
+            "print(time.perf_counter() - t)\n"
+            "print(','.join(m for m in ('matplotlib', 'plotly', 'streamlit', 'scipy') if m in sys.modules))\n"
+        )
+        duracion, pesados = salida.split('\n')[:2]
+        print(f"\nImportación de biot_savart: {float(duracion) * 1000:.0f} ms")
+        self.assertLess(float(duracion), self.PRESUPUESTO)
+        self.assertEqual(pesados, '')
+
+    def test_main_sin_efectos_al_importar(self):
+        self.assertEqual(self._ejecutar("import main"), '')
+
+class TestParticulas(unittest.TestCase):
+
+    def test_orbita_ciclotron(self):
+        # En un campo uniforme B0 z, radio r = m v / (q B0) y |v| constante
+        B0, v = 1e-3, 1e4
+        campo_uniforme = lambda r: np.tile([0.0, 0.0, B0], (len(r), 1))
+        r0 = np.array([[0.0, 0.0, 0.0], [0.5, 0.5, 0.0]])
+        v0 = np.array([[v, 0.0, 0.0], [0.0, v, 0.0]])
+        periodo = 2 * np.pi * m_proton / (q_proton * B0)
+
+        trayectorias, v_final, paso_perdida = empujar_particulas(
+            r0, v0, q_proton, m_proton, campo_uniforme, periodo / 400, 400)
+
+        radio = m_proton * v / (q_proton * B0)
+        centro = trayectorias[:-1].mean(axis=0)  # una vuelta completa
+        distancias = np.linalg.norm(trayectorias - centro, axis=2)
+        self.assertTrue(np.allclose(distancias, radio, rtol=1e-4))
+        self.assertTrue(np.allclose(np.linalg.norm(v_final, axis=1), v))
+        self.assertTrue(np.all(paso_perdida == -1))
+
+    def test_perdidas_en_conductor_y_borde(self):
+        sin_campo = lambda r: np.zeros_like(r)
+        r0 = np.array([[0.105, 0.0, 0.0], [0.0, 0.0, 0.0], [0.105, 0.0, 0.0]])
+        v0 = np.array([[-1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0]])
+        trayectorias, _, paso_perdida = empujar_particulas(
+            r0, v0, q_proton, m_proton, sin_campo, 0.01, 200,
+            limites=[(-0.5, 0.5)] * 3, geometria={'tipo': 'alambre', 'L': 2.0})
+
+        # Choca con el alambre, nace dentro del conductor, sale por la caja
+        self.assertEqual(paso_perdida.tolist(), [10, 0, 40])
+        self.assertTrue(np.isnan(trayectorias[-1]).all())
+
+        # Con cada = 3 los pasos 10 y 40 no se guardan, pero el impacto sí
+        trayectorias, _, _ = empujar_particulas(
+            r0, v0, q_proton, m_proton, sin_campo, 0.01, 200, cada=3,
+            limites=[(-0.5, 0.5)] * 3, geometria={'tipo': 'alambre', 'L': 2.0})
+        self.assertTrue(np.allclose(trayectorias[4, 0], [0.005, 0, 0], atol=1e-6))
+        self.assertTrue(np.allclose(trayectorias[14, 2], [0.505, 0, 0], atol=1e-6))
+        self.assertTrue(np.isnan(trayectorias[5:, 0]).all())
+
+    def test_malla_con_nodos_sobre_conductores(self):
+        # Con 31 nodos por eje hay nodos sobre el alambre y sobre la espira, p. ej. (0.5, 0, 0)
+        eje = np.linspace(-1.5, 1.5, 31)
+        campo = mapa_de_campo(campo_escena(I_alambre=10.0, I_espira=5.0), eje, eje, eje)
+        self.assertTrue(np.isfinite(campo(np.array([[0.5, 0, 0], [0.45, 0.02, 0.03], [0, 0, 0.3]]))).all())
+
+        trayectorias, _, paso_perdida = empujar_particulas(
+            [[0.45, 0.02, 0.03]], [[1e4, 0, 0]], q_electron, m_electron, campo, 1e-8, 100,
+            limites=[(-1.5, 1.5)] * 3, geometria={'tipo': 'ambos', 'L': 2.0, 'a': 0.5})
+        self.assertEqual(paso_perdida.tolist(), [-1])
+        self.assertTrue(np.isfinite(trayectorias).all())
+
+        # Un campo que deja de ser finito descarta la partícula en vez de propagar NaN
+        campo_singular = lambda r: np.where(r[:, :1] > 0.1, np.nan, 0.1) * np.ones((1, 3))
+        trayectorias, _, paso_perdida = empujar_particulas(
+            [[0.0, 0.0, 0.0], [0.5, 0.0, 0.0]], [[1.0, 0, 0], [1.0, 0, 0]], q_proton, m_proton,
+            campo_singular, 0.01, 30)
+        self.assertEqual(paso_perdida.tolist(), [-1, 1])
+        self.assertTrue(np.isfinite(trayectorias[-1, 0]).all())
+        self.assertTrue(np.isnan(trayectorias[-1, 1]).all())
+
+    def test_interpolador_exacto_en_campos_lineales(self):
+        x, y, z = np.linspace(-1, 1, 5), np.linspace(0, 2, 4), np.linspace(-1, 0, 3)
+        lineal = lambda r: r @ np.array([[1.0, 2.0, 0.0], [0.0, -1.0, 3.0], [0.5, 0.0, 1.0]])
+        campo = interpolador_malla(x, y, z, lineal(puntos_malla(x, y, z, 0, 60)))
+        r = np.random.default_rng(0).uniform([-1, 0, -1], [1, 2, 0], size=(20, 3))
+        self.assertTrue(np.allclose(campo(r), lineal(r)))
+
+class TestNucleos(unittest.TestCase):
+
+    def setUp(self):
+        self.r = np.random.default_rng(0).uniform(-1.5, 1.5, size=(500, 3))
+
+    @unittest.skipUnless(find_spec('numba'), "numba no está instalado")
+    def test_numba_coincide_con_numpy(self):
+        casos = [
+            lambda nucleo: campo_alambre(10.0, 2.0, 300, self.r, 0.3, nucleo=nucleo),
+            lambda nucleo: campo_espira(5.0, 0.5, 300, self.r, -0.2, nucleo=nucleo),
+            lambda nucleo: potencial_alambre(10.0, 2.0, 300, self.r, 0.3, nucleo=nucleo),
+            lambda nucleo: potencial_espira(5.0, 0.5, 300, self.r, -0.2, nucleo=nucleo),
+        ]
+        for campo in casos:
+            B_numpy = campo('numpy')
+            for nucleo in ('numba', 'auto'):
+                self.assertTrue(np.allclose(campo(nucleo), B_numpy,
+                                            rtol=1e-12, atol=1e-12 * np.abs(B_numpy).max()))
+
+    @unittest.skipUnless(find_spec('numba'), "numba no está instalado")
+    def test_numba_no_cambia_la_configuracion_global(self):
+        # En un proceso limpio: la preferencia de capas de hilos sólo se aplica
+        # durante el primer lanzamiento y después se restaura
+        codigo = ("import numpy as np, numba; antes = list(numba.config.THREADING_LAYER_PRIORITY); "
+                  "from biot_savart import campo_alambre; "
+                  "campo_alambre(1.0, 2.0, 50, np.ones((4, 3)), nucleo='numba'); "
+                  "print(antes == list(numba.config.THREADING_LAYER_PRIORITY), numba.threading_layer())")
+        entorno = {k: v for k, v in os.environ.items() if not k.startswith('NUMBA_THREADING_LAYER')}
+        salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), env=entorno, check=True).stdout.split()
+        self.assertEqual(salida[0], 'True')
+        self.assertNotEqual(salida[1], 'tbb')
+
+    def test_respaldo_numpy_si_falta_la_dependencia(self):
+        def fabrica_sin_dependencia():
+            raise ImportError("No module named 'acelerador'")
+
+        registrar_nucleo('prueba', fabrica_sin_dependencia)
+        try:
+            with warnings.catch_warnings(record=True) as avisos:
+                warnings.simplefilter('always')
+                B = campo_alambre(10.0, 2.0, 100, self.r, nucleo='prueba')
+            self.assertEqual(len(avisos), 1)
+            self.assertIs(obtener_nucleo('prueba'), obtener_nucleo('numpy'))
+            # Sin fábrica de potencial también se usa el de NumPy
+            with self.assertWarns(RuntimeWarning):
+                self.assertIs(obtener_nucleo('prueba', 'potencial'), obtener_nucleo('numpy', 'potencial'))
+            self.assertTrue(np.array_equal(B, campo_alambre(10.0, 2.0, 100, self.r)))
+        finally:
+            _FABRICAS.pop('prueba')
+
+    def test_nucleo_desconocido(self):
+        with self.assertRaises(ValueError):
+            campo_espira(5.0, 0.5, 100, self.r, nucleo='fortran')
+
+class TestNivelDeDetalle(unittest.TestCase):
+
+    def test_seleccion_de_conos(self):
+        eje = np.linspace(-1.5, 1.5, 12)
+        xx, yy, zz = np.meshgrid(eje, eje, eje)
+        r = np.c_[xx.ravel(), yy.ravel(), zz.ravel()]
+        B = campo_escena(I_alambre=10.0, I_espira=5.0, N=200)(r)
+        geometria = {'tipo': 'ambos', 'L': 2.0, 'a': 0.5}
+
+        idx = seleccionar_conos(*r.T, *B.T, 300, geometria)
+        self.assertEqual(len(np.unique(idx)), 300)
+        # Determinista y sesgada hacia las fuentes (el campo más intenso)
+        self.assertTrue(np.array_equal(idx, seleccionar_conos(*r.T, *B.T, 300, geometria)))
+        B_mag = np.linalg.norm(B, axis=1)
+        self.assertGreater(np.median(B_mag[idx]), np.median(B_mag))
+
+        fig = crear_grafico_3d_plotly(*r.T, *B.T, geometria=geometria, max_conos=300)
+        self.assertEqual(len(fig.data[0].x), 300)
+
+    def test_volumen_escalar_reducido(self):
+        eje = np.linspace(-1.5, 1.5, 30)
+        xx, yy, zz = np.meshgrid(eje, eje, eje)
+        r = np.c_[xx.ravel(), yy.ravel(), zz.ravel()]
+        B = campo_escena(I_alambre=10.0, I_espira=5.0, N=200)(r)
+        geometria = {'tipo': 'ambos', 'L': 2.0, 'a': 0.5}
+
+        solo_conos = tamano_payload(crear_grafico_3d_plotly(*r.T, *B.T, geometria=geometria, max_conos=600))
+        for escalar in ('isosuperficies', 'cortes'):
+            fig = crear_grafico_3d_plotly(*r.T, *B.T, geometria=geometria, max_conos=600, escalar=escalar)
+            volumen = fig.data[0]
+            self.assertEqual(len(volumen.value), 12**3)
+            # Los valores enviados son los de la malla original en los puntos conservados
+            i = np.argmin(np.linalg.norm(r - [volumen.x[5], volumen.y[5], volumen.z[5]], axis=1))
+            self.assertAlmostEqual(volumen.value[5], np.log10(np.linalg.norm(B[i])), places=5)
+            self.assertLess(tamano_payload(fig), 2 * solo_conos)
+
+class TestIntegrales(unittest.TestCase):
+
+    def test_ley_de_ampere(self):
+        # Alambre finito: la circulación es mu0 I (L/2) / sqrt((L/2)^2 + r^2)
+        I, L, r = 5.0, 2.0, 0.3
+        B = campo_escena(I_alambre=I, L_alambre=L, N=2000)
+        circulacion, error = integral_linea(B, camino_circulo(r), n=32)
+        teorico = mu0 * I * (L / 2) / np.sqrt((L / 2)**2 + r**2)
+        self.assertAlmostEqual(circulacion / teorico, 1, delta=1e-3)
+        self.assertLess(error, 1e-9 * teorico)
+
+    def test_flujo_alambre_largo(self):
+        # Rectángulo de alto h entre r1 y r2 junto a un alambre muy largo:
+        # flujo = mu0 I h ln(r2/r1) / (2 pi); la normal -y lo hace negativo
+        I, h, r1, r2 = 5.0, 0.1, 0.1, 0.3
+        B = campo_escena(I_alambre=I, L_alambre=200, N=20001)
+        valor, error = flujo(B, superficie_rectangulo([r1, 0, -h / 2], [r2 - r1, 0, 0], [0, 0, h]), n=8)
+        teorico = -mu0 * I * h * np.log(r2 / r1) / (2 * np.pi)
+        self.assertAlmostEqual(valor / teorico, 1, delta=1e-4)
+
+    def test_stokes_coincide_con_flujo_de_superficie(self):
+        B = campo_escena(I_espira=3.0, a_espira=0.5, N=1000)
+        A = potencial_escena(I_espira=3.0, a_espira=0.5, N=1000)
+        centro = (0, 0, 0.2)
+
+        disco, _ = flujo(B, superficie_disco(0.3, centro), n=12)
+        por_borde, _ = flujo_por_potencial(A, camino_circulo(0.3, centro), n=32)
+        self.assertAlmostEqual(disco / por_borde, 1, delta=1e-10)
+
+        rect = ([-0.2, -0.2, 0.2], [0.4, 0, 0], [0, 0.4, 0])
+        por_rect, _ = flujo_por_potencial(A, borde_rectangulo(*rect))
+        self.assertAlmostEqual(flujo(B, superficie_rectangulo(*rect))[0] / por_rect, 1, delta=1e-10)
+
+        # El mismo cuadrado partido en 2 k^2 triángulos
+        k = 20
+        lado = np.linspace(-0.2, 0.2, k + 1)
+        xx, yy = np.meshgrid(lado, lado, indexing='ij')
+        vertices = np.c_[xx.ravel(), yy.ravel(), np.full(xx.size, 0.2)]
+        v0 = (np.arange(k)[:, None] * (k + 1) + np.arange(k)).ravel()
+        triangulos = np.concatenate([np.c_[v0, v0 + k + 1, v0 + k + 2], np.c_[v0, v0 + k + 2, v0 + 1]])
+        en_malla, error_malla = flujo_malla(B, vertices, triangulos)
+        self.assertLess(abs(en_malla - por_rect), error_malla)
+        self.assertLess(error_malla, 1e-5 * abs(por_rect))
+
 if __name__ == '__main__':
     unittest.main()